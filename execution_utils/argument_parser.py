@@ -10,5 +10,29 @@ def parse_args():
                         action="store_true")
     parser.add_argument('--collectonly', '-collect', help='Only collect tests, does not execute them',
                         action="store_true")
+    parser.add_argument('--cassette', help='Record API interactions to cassette or replay them without network. '
+                                           'By default cassette_mode from config file is used',
+                        choices=["off", "record", "replay"], default=None)
+    parser.add_argument('--load', help='Run load against API instead of tests', action="store_true")
+    parser.add_argument('--load-mix', help='Operations with weights, e.g. get_user=8,list_issues=2. '
+                                           'Available: get_user, list_issues, list_branches, create_issues',
+                        type=str, default="get_user=1")
+    parser.add_argument('--load-rate', help='Calls started per second, 0 means as fast as possible',
+                        type=float, default=10)
+    parser.add_argument('--load-concurrency', help='Max number of calls in flight', type=int, default=10)
+    parser.add_argument('--load-duration', help='Length of load run in seconds', type=float, default=60)
+    parser.add_argument('--workers', '-w', help='Number of processes to run tests in parallel, '
+                                               'tests of one module always run in the same process. '
+                                               'With --matrix every config is run in this number of processes',
+                        type=int, default=1)
+    parser.add_argument('--matrix', help='Run tests of many configs at the same time, one process per config. '
+                                         'Accepts config names and patterns from configuration folder, '
+                                         'e.g. --matrix "config_*.ini"', nargs='+', default=None)
+    parser.add_argument('--matrix-processes', help='Max number of configs run at the same time, '
+                                                   'by default all configs are run at once', type=int, default=0)
+    parser.add_argument('--log-queue', help='Write logs from background thread through bounded queue. When queue is '
+                                            'full "drop" discards records and "block" waits for free space',
+                        choices=["off", "drop", "block"], default="off")
+    parser.add_argument('--log-queue-size', help='Max number of log records waiting in queue', type=int, default=10000)
     args = parser.parse_args()
     return args
@@ -2,15 +2,164 @@
 Setup test data before test execution
 """
 
+import hashlib
+import json
+import logging
 import random
 import os
 import string
+import struct
+import sys
+import threading
+from array import array
+from typing import Any, Callable, Dict, Iterator, List
 
 from utils_sdk import Properties
 
 
 PROPERTIES = Properties()
 
+_MISSING = object()
+_OFFSET = struct.Struct('<Q')
+DATASETS = ('users', 'repos', 'labels', 'issues')
+
+
+def _word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+def _text(rng: random.Random, options: Dict, min_words: int, max_words: int) -> str:
+    return " ".join(rng.choices(options['words'], k=rng.randint(min_words, max_words)))
+
+
+def _user(rng: random.Random, number: int, options: Dict) -> Dict:
+    login = "{}{}".format(_word(rng, 7).capitalize(), number)
+    return {'login': login, 'password': _word(rng, 9), 'email': "{}@example.com".format(login.lower())}
+
+
+def _repo(rng: random.Random, number: int, options: Dict) -> Dict:
+    return {'owner': options['owner'], 'name': "repo-{}-{}".format(number, _word(rng, 6)),
+            'description': _text(rng, options, 3, 8), 'private': rng.random() < 0.5}
+
+
+def _label(rng: random.Random, number: int, options: Dict) -> Dict:
+    return {'name': "label-{}".format(number), 'color': "{:06x}".format(rng.randrange(0x1000000)),
+            'description': _text(rng, options, 2, 5)}
+
+
+def _issue(rng: random.Random, number: int, options: Dict) -> Dict:
+    # Keys are arguments of Issues.create_issues, so specs can be passed to Issues.create_issues_bulk as is
+    return {'title': "Issue {} {}".format(number, _word(rng, 8)),
+            'body': _text(rng, options, 5, 30),
+            'assignees': options['owner'],
+            'labels': "label-{}".format(rng.randrange(options['labels'])) if options.get('labels') else "bug"}
+
+
+_RECORDS = {'users': _user, 'repos': _repo, 'labels': _label, 'issues': _issue}
+
+
+def generate_dataset(path: str, kind: str, count: int, seed: int, batch_size: int = 1000, **options) -> Dict:
+    """
+    Generate records and write them to JSON lines file with index of line offsets next to it.
+    Every batch has its own random generator derived from seed, so the same seed always gives the same records
+
+    :param path: Path to .jsonl file, index is written to the same path with .idx extension
+    :param kind: Kind of records: users, repos, labels or issues
+    :param count: Number of records
+    :param seed: Seed of random generator
+    :param batch_size: Number of records generated and written at once
+    :param options: owner - login used as repository owner and issue assignee,
+        labels - number of generated labels to pick issue labels from
+    :return: Dictionary with path and parameters of generated dataset, also written to .meta.json file
+        next to the dataset
+    """
+    parameters = {'kind': kind, 'count': count, 'seed': seed, 'batch_size': batch_size,
+                  'owner': options.get('owner'), 'labels': options.get('labels', 0)}
+    make_record = _RECORDS[kind]
+    # Texts are built from vocabulary generated once, random letters are drawn only for names
+    vocabulary_rng = random.Random("{}:words".format(seed))
+    options['words'] = [_word(vocabulary_rng, vocabulary_rng.randint(2, 10)) for _ in range(2048)]
+    offsets = array('Q')
+    offset = 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as data_file:
+        for batch_start in range(0, count, batch_size):
+            rng = random.Random("{}:{}:{}".format(seed, kind, batch_start))
+            lines = [json.dumps(make_record(rng, number, options), separators=(',', ':')).encode() + b'\n'
+                     for number in range(batch_start, min(batch_start + batch_size, count))]
+            for line in lines:
+                offsets.append(offset)
+                offset += len(line)
+            data_file.write(b"".join(lines))
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    with open(path.replace('.jsonl', '.idx'), 'wb') as index_file:
+        offsets.tofile(index_file)
+    # Metadata is written last, so dataset interrupted while being written is never taken as complete
+    with open(path.replace('.jsonl', '.meta.json'), 'w') as meta_file:
+        json.dump(parameters, meta_file)
+    logging.info("{} {} were generated to '{}'".format(count, kind, path))
+    return dict(parameters, path=path)
+
+
+def is_dataset_current(path: str, kind: str, count: int, seed: int, batch_size: int = 1000, **options) -> bool:
+    """
+    Check that dataset file was generated with the same parameters and is complete
+
+    :param path: Path to .jsonl file
+    :param kind: Kind of records: users, repos, labels or issues
+    :param count: Number of records
+    :param seed: Seed of random generator
+    :param batch_size: Number of records generated and written at once
+    :param options: Options of generate_dataset
+    :return: True if dataset doesn't need to be generated again
+    """
+    parameters = {'kind': kind, 'count': count, 'seed': seed, 'batch_size': batch_size,
+                  'owner': options.get('owner'), 'labels': options.get('labels', 0)}
+    try:
+        with open(path.replace('.jsonl', '.meta.json'), 'r') as meta_file:
+            if json.load(meta_file) != parameters:
+                return False
+        return os.path.exists(path) and len(Dataset(path)) == count
+    except (OSError, ValueError):
+        return False
+
+
+class Dataset:
+    """
+    Read only access to generated JSON lines file. Records are read from disk by index when requested,
+    the file is never loaded into memory
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to .jsonl file written by generate_dataset
+        """
+        self.path = path
+        self.index_path = path.replace('.jsonl', '.idx')
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.index_path) // _OFFSET.size
+
+    def __getitem__(self, number: int) -> Dict:
+        length = len(self)
+        if number < 0:
+            number += length
+        if not 0 <= number < length:
+            raise IndexError("Dataset '{}' has {} records, record {} was requested".format(self.path, length,
+                                                                                         number))
+        with open(self.index_path, 'rb') as index_file:
+            index_file.seek(number * _OFFSET.size)
+            offset, = _OFFSET.unpack(index_file.read(_OFFSET.size))
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(offset)
+            return json.loads(data_file.readline())
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open(self.path, 'rb') as data_file:
+            for line in data_file:
+                yield json.loads(line)
+
 
 class PropertyConfigurator:
     """
@@ -19,28 +168,234 @@ class PropertyConfigurator:
 
     _config_file = None
     _json_file = None
+    _save_file = None
+    _reuse_previous_test_data = False
+    _test_data = Properties()
+    _validated = set()
+    _lock = threading.RLock()
 
     @classmethod
-    def initialize(cls, config_file: str):
+    def initialize(cls, config_file: str, reuse_previous_test_data: bool = False, worker: int = None):
         """
         Initialize config file to work with
 
         :param config_file: Name of config file
         :param reuse_previous_test_data: If True, test data from previous execution will be used.
             If False, new test data will be generated
+        :param worker: Number of parallel worker. Worker reads snapshot of parent process and saves test data
+            it creates to its own file, parent joins these files by merge_workers
         :return: None
         """
         base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
         cls._config_file = os.path.abspath("{}/configuration/{}".format(base_path, config_file))
-
+        cls._json_file = os.path.abspath("{}/resources/test_data/{}".format(base_path,
+                                                                           config_file.replace('.ini', '.json')))
+        cls._save_file = cls._worker_file(worker) if worker is not None else cls._json_file
+        cls._reuse_previous_test_data = reuse_previous_test_data
 
     @classmethod
     def setup(cls):
         """
-        Generate test data and store it in PROPERTIES object
+        Generate test data and store it in PROPERTIES object. If previous test data should be reused and
+        it was generated for the same config file, it is read from snapshot instead
         """
         PROPERTIES.append_config_data(cls._config_file)
         PROPERTIES.report_file = os.path.basename(cls._config_file).replace('config', 'report').replace('.ini', '.xml')
         PROPERTIES.allure_report_folder = "{}/{}".format(PROPERTIES.allure_report_path,
                                                          PROPERTIES.report_file.split(".")[0])
+
+        fingerprint = cls._fingerprint()
+        with cls._lock:
+            cls._validated = set()
+            if cls._reuse_previous_test_data and os.path.exists(cls._json_file):
+                cls._test_data = Properties()
+                cls._test_data.deserialize(cls._json_file)
+                if getattr(cls._test_data, 'test_data_fingerprint', None) == fingerprint:
+                    PROPERTIES.deserialize(cls._json_file)
+                    logging.info("Test data from previous execution is reused from '{}'".format(cls._json_file))
+                else:
+                    logging.info("Test data in '{}' was generated for another config and is not reused".format(
+                        cls._json_file))
+                    cls._test_data = Properties()
+            else:
+                cls._test_data = Properties()
+            if getattr(cls._test_data, 'test_data_fingerprint', None) != fingerprint:
+                cls._test_data.test_data_fingerprint = fingerprint
+                cls._save()
+
+        for kind in DATASETS:
+            if int(getattr(PROPERTIES, 'data_' + kind, 0)):
+                cls.dataset(kind)
+
+    @classmethod
+    def get_or_create(cls, name: str, create: Callable[[], Any], validate: Callable[[Any], bool] = None) -> Any:
+        """
+        Get test data item, e.g. id of created issue, from snapshot or create it. Item from previous execution
+        is validated once per execution, when it is requested for the first time
+
+        :param name: Name of property to store item in
+        :param create: Function to create item, e.g. with API call. Return value should be json serializable
+        :param validate: Function to check that item from previous execution still can be used,
+            e.g. issue still exists on server. If not set, reused item is always valid
+        :return: Item value
+
+        :Example:
+
+        .. code-block:: python
+
+            issue_number = PropertyConfigurator.get_or_create(
+                "demo_issue_number",
+                create=lambda: github_api.issues.create_issues(owner, repo, "Demo", "", owner, "bug").json['number'],
+                validate=lambda number: number in [issue['number'] for issue in github_api.issues.iter_issues(owner,
+                                                                                                             repo)])
+        """
+        with cls._lock:
+            value = getattr(cls._test_data, name, _MISSING)
+            if value is not _MISSING and name not in cls._validated:
+                if validate is None or validate(value):
+                    cls._validated.add(name)
+                else:
+                    logging.info("Test data item '{}' from previous execution is not valid anymore".format(name))
+            if name in cls._validated:
+                return value
+
+            value = create()
+            setattr(cls._test_data, name, value)
+            setattr(PROPERTIES, name, value)
+            cls._validated.add(name)
+            cls._save()
+            return value
+
+    @classmethod
+    def dataset(cls, kind: str) -> Dataset:
+        """
+        Get generated dataset. Dataset is generated with data_seed, data_batch_size and data_<kind> count
+        from config file and is generated again only if it is missing, incomplete or these parameters change
+
+        :param kind: Kind of records: users, repos, labels or issues
+        :return: Dataset with lazy access to records by index
+
+        :Example:
+
+        .. code-block:: python
+
+            issues = PropertyConfigurator.dataset("issues")
+            print(len(issues), issues[42]["title"])
+            github_api.issues.create_issues_bulk(owner, repo, itertools.islice(issues, 100))
+        """
+        path = os.path.join(os.path.dirname(cls._json_file), "{}_{}.jsonl".format(
+            os.path.basename(cls._json_file).replace('.json', ''), kind))
+        parameters = {'kind': kind, 'count': int(getattr(PROPERTIES, 'data_' + kind, 0)),
+                      'seed': int(PROPERTIES.data_seed), 'batch_size': int(PROPERTIES.data_batch_size),
+                      'owner': PROPERTIES.assignees, 'labels': int(getattr(PROPERTIES, 'data_labels', 0))}
+        with cls._lock:
+            if is_dataset_current(path, **parameters):
+                logging.debug("{} {} are reused from '{}'".format(parameters['count'], kind, path))
+            else:
+                generate_dataset(path, **parameters)
+        return Dataset(path)
+
+    @classmethod
+    def seeded_issues(cls, github_api) -> List[int]:
+        """
+        Get numbers of issues created from generated issues dataset. Issues are created once and reused
+        by later executions while all of them are open
+
+        :param github_api: GITHUB object to create and check issues with
+        :return: Issue numbers, empty list if data_issues is 0 in config file
+
+        :Example:
+
+        .. code-block:: python
+
+            for number in PropertyConfigurator.seeded_issues(github_api):
+                print(number)
+        """
+        if not int(getattr(PROPERTIES, 'data_issues', 0)):
+            return []
+        owner, repo = PROPERTIES.assignees, PROPERTIES.repo
+
+        def create() -> List[int]:
+            responses = github_api.issues.create_issues_bulk(owner, repo, cls.dataset("issues"),
+                                                             concurrency=int(getattr(PROPERTIES,
+                                                                                     'cleanup_concurrency', 8)))
+            numbers = sorted(response.json['number'] for response in responses if response.status_code == 201)
+            logging.info("{} issues were seeded to '{}/{}'".format(len(numbers), owner, repo))
+            return numbers
+
+        def validate(numbers: List[int]) -> bool:
+            open_numbers = {issue['number'] for issue in github_api.issues.iter_issues(owner, repo)}
+            return open_numbers.issuperset(numbers)
+
+        return cls.get_or_create("seeded_issues", create, validate)
+
+    @classmethod
+    def seeded_branch(cls, github_api, branch: str) -> str:
+        """
+        Get name of branch tests work with. Branch is looked up on server once per execution
+
+        :param github_api: GITHUB object to check branches with
+        :param branch: Branch name
+        :return: Branch name
+        :raises ValueError: If branch doesn't exist
+        """
+        owner, repo = PROPERTIES.assignees, PROPERTIES.repo
+
+        def exists(name: str) -> bool:
+            return any(item['name'] == name for item in github_api.branch.iter_branches(owner, repo))
+
+        def create() -> str:
+            if not exists(branch):
+                raise ValueError("Branch '{}' doesn't exist in '{}/{}'".format(branch, owner, repo))
+            return branch
+
+        return cls.get_or_create("seeded_branch_{}".format(branch), create, exists)
+
+    @classmethod
+    def _fingerprint(cls) -> str:
+        """
+        Return hash of config file, snapshot is reused only if config file is not changed
+        """
+        with open(cls._config_file, 'rb') as config_file:
+            return hashlib.sha256(config_file.read()).hexdigest()
+
+    @classmethod
+    def merge_workers(cls, workers: int):
+        """
+        Add test data created by parallel workers to snapshot. Worker files are deleted
+
+        :param workers: Number of workers
+        :return: None
+        """
+        with cls._lock:
+            merged = 0
+            for worker in range(1, workers + 1):
+                worker_file = cls._worker_file(worker)
+                if not os.path.exists(worker_file):
+                    continue
+                with open(worker_file, 'r') as data_file:
+                    worker_data = json.load(data_file)
+                for name, value in worker_data.items():
+                    setattr(cls._test_data, name, value)
+                    setattr(PROPERTIES, name, value)
+                os.remove(worker_file)
+                merged += 1
+            if merged:
+                cls._save()
+                logging.info("Test data of {} workers was merged to '{}'".format(merged, cls._json_file))
+
+    @classmethod
+    def _worker_file(cls, worker: int) -> str:
+        return cls._json_file.replace('.json', '_w{}.json'.format(worker))
+
+    @classmethod
+    def _save(cls):
+        """
+        Write test data snapshot, temporary file is renamed over snapshot so it is never read partially written.
+        Parallel workers write own files, so they don't overwrite items created by each other
+        """
+        os.makedirs(os.path.dirname(cls._save_file), exist_ok=True)
+        temp_file = "{}.{}.tmp".format(cls._save_file, os.getpid())
+        cls._test_data.serialize(temp_file)
+        os.replace(temp_file, cls._save_file)
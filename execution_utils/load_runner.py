@@ -0,0 +1,227 @@
+"""
+Load generation over GITHUB resource methods
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from github_sdk import GITHUB
+from utils_sdk import Properties
+
+
+def _operations(properties: Properties) -> Dict[str, Callable[[GITHUB, int], object]]:
+    """
+    Return resource calls available for load mix
+
+    :param properties: Execution properties with owner and repository
+    :return: Dictionary with operation names and functions accepting GITHUB object and sequence number
+    """
+    owner, repo = properties.assignees, properties.repo
+    return {
+        'get_user': lambda api, n: api.user.get_user(),
+        'list_issues': lambda api, n: api.issues.list_issues(owner, repo, per_page=30),
+        'list_branches': lambda api, n: list(api.branch.iter_branches(owner, repo)),
+        'create_issues': lambda api, n: api.issues.create_issues(owner, repo, title="Load test issue {}".format(n),
+                                                                 body="Created by load run", assignees=owner,
+                                                                 labels="load"),
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse operation mix, e.g. "get_user=8,list_issues=2" means 80% of calls are get_user and 20% are list_issues
+
+    :param mix: Comma separated operation=weight pairs, weight is 1 if omitted
+    :return: Dictionary with operations and weights
+    """
+    weights = dict()
+    for item in filter(None, (part.strip() for part in mix.split(","))):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight) if weight else 1.0
+    return weights
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(percent / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+class LoadRunner:
+    """
+    Sends declared mix of operations at fixed rate with bounded concurrency and collects per-endpoint statistics
+    """
+
+    def __init__(self, properties: Properties, mix: str, rate: float, concurrency: int, duration: float):
+        """
+        :param properties: Execution properties with github_url, github_token, assignees and repo
+        :param mix: Operation mix, e.g. "get_user=8,list_issues=2". Available operations are
+            get_user, list_issues, list_branches and create_issues
+        :param rate: Calls started per second, 0 means as fast as concurrency allows
+        :param concurrency: Max number of calls in flight
+        :param duration: Length of the run in seconds
+        :raises ValueError: If mix contains unknown operation
+        """
+        operations = _operations(properties)
+        self.weights = parse_mix(mix)
+        unknown = set(self.weights) - set(operations)
+        if unknown or not self.weights:
+            raise ValueError("Unknown load operations {}, available are {}".format(sorted(unknown),
+                                                                                  sorted(operations)))
+        self.operations = operations
+        self.rate = rate
+        self.concurrency = concurrency
+        self.duration = duration
+        self.github_api = GITHUB(properties.github_url, properties.github_token)
+        self._latencies = {name: [] for name in self.weights}
+        self._errors = {name: 0 for name in self.weights}
+        self._statuses = {name: dict() for name in self.weights}
+        self._lock = threading.Lock()
+        # Call is late if it started more than one interval after its schedule
+        self._late_after = max(1.0 / rate if rate else 0.0, 0.001)
+        self._late = 0
+        self.elapsed = 0.0
+
+    def _call(self, name: str, number: int, scheduled: float):
+        """
+        Call operation and record its latency measured from the time the call was scheduled to start,
+        so time spent waiting for free concurrency slot is counted (no coordinated omission)
+
+        :param name: Operation name
+        :param number: Sequence number of the call
+        :param scheduled: perf_counter time the call should have started at
+        :return: None
+        """
+        start = time.perf_counter()
+        status = None
+        try:
+            result = self.operations[name](self.github_api, number)
+            status = getattr(result, 'status_code', 200)
+        except Exception as msg:
+            logging.debug("LOAD: {} failed: {}".format(name, msg))
+            status = type(msg).__name__
+        latency = time.perf_counter() - scheduled
+        with self._lock:
+            self._latencies[name].append(latency)
+            if start - scheduled > self._late_after:
+                self._late += 1
+            self._statuses[name][str(status)] = self._statuses[name].get(str(status), 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                self._errors[name] += 1
+
+    def run(self) -> Dict:
+        """
+        Run load for configured duration
+
+        :return: Report dictionary
+        """
+        names, weights = list(self.weights), list(self.weights.values())
+        slots = threading.BoundedSemaphore(self.concurrency)
+        interval = 1.0 / self.rate if self.rate else 0.0
+        logging.info("LOAD: Starting {} calls/s with concurrency {} for {} seconds, mix {}".format(
+            self.rate or "max", self.concurrency, self.duration, self.weights))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            number = 0
+            while True:
+                now = time.perf_counter()
+                scheduled = start + number * interval if interval else now
+                if scheduled - start >= self.duration or now - start >= self.duration:
+                    break
+                if scheduled - now > 0:
+                    time.sleep(scheduled - now)
+                # Saturated runner stops at the deadline, calls it could not send are reported as missed
+                if not slots.acquire(timeout=max(start + self.duration - time.perf_counter(), 0)):
+                    break
+                if time.perf_counter() - start >= self.duration:
+                    slots.release()
+                    break
+                name = random.choices(names, weights)[0]
+                future = executor.submit(self._call, name, number, scheduled)
+                future.add_done_callback(lambda _: slots.release())
+                number += 1
+        self.elapsed = max(time.perf_counter() - start, self.duration)
+        return self.report()
+
+    def report(self) -> Dict:
+        """
+        Build statistics of the run
+
+        :return: Dictionary with total and per-endpoint throughput, latency percentiles in milliseconds measured
+            from scheduled start of calls, errors and number of scheduled calls that were not sent or started late
+        """
+        endpoints = dict()
+        for name, latencies in self._latencies.items():
+            values = sorted(latencies)
+            count = len(values)
+            endpoints[name] = {
+                'count': count,
+                'throughput': round(count / self.elapsed, 3) if self.elapsed else 0.0,
+                'p50_ms': round(_percentile(values, 50) * 1000, 2),
+                'p95_ms': round(_percentile(values, 95) * 1000, 2),
+                'p99_ms': round(_percentile(values, 99) * 1000, 2),
+                'max_ms': round(values[-1] * 1000, 2) if values else 0.0,
+                'errors': self._errors[name],
+                'error_rate': round(self._errors[name] / count, 4) if count else 0.0,
+                'statuses': self._statuses[name],
+            }
+        total = sum(endpoint['count'] for endpoint in endpoints.values())
+        errors = sum(endpoint['errors'] for endpoint in endpoints.values())
+        scheduled = math.ceil(self.duration * self.rate) if self.rate else total
+        return {'duration': round(self.elapsed, 3), 'rate': self.rate, 'concurrency': self.concurrency,
+                'mix': self.weights, 'count': total,
+                'throughput': round(total / self.elapsed, 3) if self.elapsed else 0.0,
+                'scheduled': scheduled, 'missed': max(scheduled - total, 0), 'late': self._late,
+                'error_rate': round(errors / total, 4) if total else 0.0, 'endpoints': endpoints}
+
+
+def format_table(report: Dict) -> str:
+    """
+    Format load report as text table
+
+    :param report: Report returned by LoadRunner.run
+    :return: Table with one row per endpoint
+    """
+    header = "{:<16}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}{:>8}".format("endpoint", "count", "req/s", "p50 ms",
+                                                                    "p95 ms", "p99 ms", "max ms", "err %")
+    lines = [header, "-" * len(header)]
+    for name, stats in sorted(report['endpoints'].items()):
+        lines.append("{:<16}{:>8}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}{:>8.2f}".format(
+            name, stats['count'], stats['throughput'], stats['p50_ms'], stats['p95_ms'], stats['p99_ms'],
+            stats['max_ms'], stats['error_rate'] * 100))
+    lines.append("-" * len(header))
+    lines.append("total {} calls in {:.2f} s, {:.2f} req/s, {:.2f}% errors".format(
+        report['count'], report['duration'], report['throughput'], report['error_rate'] * 100))
+    if report['rate']:
+        lines.append("target {:.2f} req/s, {} of {} scheduled calls were not sent, {} started late".format(
+            report['rate'], report['missed'], report['scheduled'], report['late']))
+    return "\n".join(lines)
+
+
+def write_report(report: Dict, report_path: str, report_file: str) -> str:
+    """
+    Write report as json and as text table next to junit report
+
+    :param report: Report returned by LoadRunner.run
+    :param report_path: Reports folder
+    :param report_file: Junit report file name, e.g. report.xml
+    :return: Path to json report
+    """
+    os.makedirs(report_path, exist_ok=True)
+    base = os.path.join(report_path, report_file.replace('.xml', '_load'))
+    with open(base + ".json", 'w') as json_file:
+        json.dump(report, json_file, indent=4)
+    table = format_table(report)
+    with open(base + ".txt", 'w') as table_file:
+        table_file.write(table + "\n")
+    logging.info("LOAD: Results\n{}".format(table))
+    return base + ".json"
@@ -1,12 +1,72 @@
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
+_listener = None
 
-def initialize(config_file: str):
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread and either drops records
+    or waits for free space when the queue is full
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        """
+        :param log_queue: Bounded queue shared with listener
+        :param block: Wait for free space in full queue if True, drop record otherwise
+        """
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Listener runs in the same process, so record is passed as is and formatted by file handlers
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    """
+    Queue listener that waits for free space in full queue to stop
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def initialize(config_file: str, suffix: str = "", queue_mode: str = "off", queue_size: int = 10000):
+    """
+    Write logs to info and debug files named after config file
+
+    :param config_file: Path to config file
+    :param suffix: Suffix of log file names, e.g. number of parallel worker
+    :param queue_mode: "off" writes records on caller thread, "drop" and "block" pass records through bounded queue
+        to background thread that formats and writes them. When queue is full "drop" discards new records
+        and "block" waits for free space
+    :param queue_size: Max number of records waiting in queue
+    :return: None
+    """
+    global _listener
 
     logger = logging.getLogger()
+    # Queued records are written and files of previous initialize are closed before new files are opened
+    shutdown()
+    for handler in logger.handlers:
+        handler.close()
     logger.setLevel(0)
     formatter = logging.Formatter(u'# %(levelname)-8s [%(asctime)s] %(filename)-20s [LINE:%(lineno)s]   %(message)s')
-    log_file = config_file.replace('config', '').replace('.ini', '.log')
+    log_file = config_file.replace('config', '').replace('.ini', suffix + '.log')
 
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -19,4 +79,50 @@ def initialize(config_file: str):
     handler_debug.setFormatter(formatter)
     handler_debug.setLevel(logging.DEBUG)
 
-    logger.handlers = [handler_info, handler_debug]
+    if queue_mode == "off":
+        logger.handlers = [handler_info, handler_debug]
+        return
+
+    handler_queue = BoundedQueueHandler(queue.Queue(maxsize=queue_size), block=queue_mode == "block")
+    handler_queue.setLevel(logging.DEBUG)
+    logger.handlers = [handler_queue]
+    _listener = _Listener(handler_queue.queue, handler_info, handler_debug, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """
+    Write records left in queue, stop background logging thread started by initialize
+    and write further records on caller thread
+
+    :return: None
+    """
+    global _listener
+
+    if _listener is None:
+        return
+    logger = logging.getLogger()
+    dropped = sum(handler.dropped for handler in logger.handlers if isinstance(handler, BoundedQueueHandler))
+    _listener.stop()
+    logger.handlers = list(_listener.handlers)
+    _listener = None
+    if dropped:
+        logging.warning("{} log records were dropped because log queue was full".format(dropped))
+
+
+def _forget_listener():
+    """
+    Forked process has no listener thread, records are written by its file handlers until initialize is called.
+    Stopping the inherited listener would wait on queue that nobody reads
+    """
+    global _listener
+
+    if _listener is None:
+        return
+    logging.getLogger().handlers = list(_listener.handlers)
+    _listener = None
+
+
+atexit.register(shutdown)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_listener)
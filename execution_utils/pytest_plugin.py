@@ -0,0 +1,131 @@
+"""
+Pytest plugin with shared GITHUB client, per-test cleanup and end of session sweep of created resources,
+loaded by runner with -p execution_utils.pytest_plugin
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, List
+
+import pytest
+
+from github_sdk import GITHUB, SESSION_POOL, RateLimiter, ResourceTracker, RetryPolicy
+from execution_utils.configurators.property_configurator import PROPERTIES, PropertyConfigurator
+
+TRACKER = ResourceTracker()
+
+
+class CleanupRegistry:
+    """
+    Actions registered by test to undo its changes. Actions are run in reverse order after the test,
+    failed action doesn't stop the rest of them
+    """
+
+    def __init__(self):
+        self._actions = []
+        self._lock = threading.Lock()
+
+    def add(self, action: Callable, *args, **kwargs):
+        """
+        Register action to run after the test. Can be called from several threads
+
+        :param action: Function to call
+        :param args: Positional arguments of the function
+        :param kwargs: Keyword arguments of the function
+        :return: None
+
+        :Example:
+
+        .. code-block:: python
+
+            cleanup.add(github_api.branch.rename_branch, owner, repo, branch='demo_edit', rename_branch='demo')
+        """
+        with self._lock:
+            self._actions.append((action, args, kwargs))
+
+    def run(self):
+        """
+        Run registered actions in reverse order
+
+        :return: None
+        :raises Exception: First exception raised by actions, after all of them were run
+        """
+        with self._lock:
+            actions, self._actions = self._actions, []
+        errors = []
+        for action, args, kwargs in reversed(actions):
+            try:
+                action(*args, **kwargs)
+            except Exception as msg:
+                logging.error("Cleanup action {} failed: {}".format(getattr(action, '__qualname__', action), msg))
+                errors.append(msg)
+        if errors:
+            raise errors[0]
+
+
+@pytest.fixture(scope="session")
+def github_api() -> GITHUB:
+    """
+    GITHUB client shared by all tests of the session. Connections come from the thread-safe shared pool,
+    so the client can be used from several threads of one test. Requests are paced by rate limit headers
+    unless rate_limit is false in config file
+    """
+    rate_limiter = None
+    if getattr(PROPERTIES, 'rate_limit', 'true').lower() == "true":
+        rate_limiter = RateLimiter(pace_below=float(getattr(PROPERTIES, 'rate_limit_pace_below', 0.5)),
+                                   reserve=int(getattr(PROPERTIES, 'rate_limit_reserve', 0)))
+    return GITHUB(PROPERTIES.github_url, PROPERTIES.github_token, rate_limiter=rate_limiter)
+
+
+@pytest.fixture(scope="session")
+def seeded_issues(github_api) -> List[int]:
+    """
+    Numbers of open issues created from generated issues dataset, data_issues in config file sets their number.
+    Issues are kept after the session and reused by the next run with --reuse
+    """
+    recording, TRACKER.recording = TRACKER.recording, False
+    try:
+        return PropertyConfigurator.seeded_issues(github_api)
+    finally:
+        TRACKER.recording = recording
+
+
+@pytest.fixture(scope="session")
+def demo_branch(github_api) -> str:
+    """
+    Name of existing branch tests rename and rename back
+    """
+    return PropertyConfigurator.seeded_branch(github_api, "demo")
+
+
+@pytest.fixture()
+def cleanup() -> CleanupRegistry:
+    """
+    Registry of actions run after the test, whatever its result is
+    """
+    registry = CleanupRegistry()
+    yield registry
+    registry.run()
+
+
+def pytest_sessionstart(session):
+    if getattr(PROPERTIES, 'cleanup_created_resources', 'true').lower() == "true" \
+            and TRACKER.record not in SESSION_POOL.hooks['after_response']:
+        SESSION_POOL.add_hook("after_response", TRACKER.record)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Close issues and rename back branches changed by tests in one concurrent sweep and write cleanup report
+    next to junit report
+    """
+    if not TRACKER.pending:
+        return
+    # Sweep is paced by rate limit headers, closing issues is retried, renaming branches is not
+    github_api = GITHUB(PROPERTIES.github_url, PROPERTIES.github_token, rate_limiter=RateLimiter(),
+                        retry_policy=RetryPolicy())
+    report = TRACKER.sweep(github_api, int(getattr(PROPERTIES, 'cleanup_concurrency', 8)))
+    junit_file = session.config.option.xmlpath or os.path.join(PROPERTIES.report_path, PROPERTIES.report_file)
+    report_file = ResourceTracker.write_report(report, junit_file.replace('.xml', '_cleanup.json'))
+    logging.info("Cleanup report was written to '{}'".format(report_file))
@@ -0,0 +1,451 @@
+"""
+Test execution in one process or sharded across process pool
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Tuple
+
+import pytest
+
+from execution_utils import logger, load_runner
+from execution_utils.configurators.property_configurator import PropertyConfigurator, PROPERTIES
+from github_sdk import GITHUB, SESSION_POOL, Cassette, TimingCollector, set_payload_logging
+from utils_sdk import get_property
+
+PYTEST_PLUGIN = "execution_utils.pytest_plugin"
+
+
+def setup(args: argparse.Namespace, worker: int = None) -> TimingCollector:
+    """
+    Read properties, configure connection pool and cassette and start collecting request timings
+
+    :param args: Parsed command line arguments
+    :param worker: Number of parallel worker, None for single process run
+    :return: Collector of request timings
+    """
+    # Workers reuse test data prepared by parent process
+    PropertyConfigurator.initialize(args.config, args.reuse or worker is not None, worker)
+    PropertyConfigurator.setup()
+    cassette_mode = args.cassette or PROPERTIES.cassette_mode
+    if cassette_mode != "off":
+        SESSION_POOL.configure(cassette=Cassette(_cassette_file(args, worker if cassette_mode == "record" else None),
+                                                 mode=cassette_mode,
+                                                 strict=PROPERTIES.cassette_strict.lower() == "true"))
+    # Pool keeps a connection for every thread sending requests at once
+    pool_maxsize = max(int(PROPERTIES.pool_maxsize), int(getattr(PROPERTIES, 'cleanup_concurrency', 8)),
+                       args.load_concurrency if args.load else 0)
+    SESSION_POOL.configure(pool_maxsize=pool_maxsize,
+                           pool_block=getattr(PROPERTIES, 'pool_block', 'true').lower() == "true",
+                           keep_alive=PROPERTIES.keep_alive.lower() == "true",
+                           prewarm=int(PROPERTIES.prewarm_connections))
+    set_payload_logging(int(PROPERTIES.payload_log_max_bytes), PROPERTIES.payload_sidecar_path or None)
+    # Open pooled connections once, all GITHUB objects created by tests reuse them
+    GITHUB(PROPERTIES.github_url, PROPERTIES.github_token)
+    timings = TimingCollector()
+    SESSION_POOL.add_hook("after_response", timings.record)
+    return timings
+
+
+def teardown(timings: TimingCollector, allure_folder: str):
+    """
+    Save recorded cassette and export request timings
+
+    :param timings: Collector returned by setup
+    :param allure_folder: Allure results folder to export timings to
+    :return: None
+    """
+    if SESSION_POOL.settings['cassette'] is not None:
+        SESSION_POOL.settings['cassette'].save()
+    timings.export_allure(allure_folder)
+    logging.info("API request timings\n{}".format(timings.format_table()))
+
+
+def _cassette_file(args: argparse.Namespace, worker: int = None) -> str:
+    suffix = "_w{}".format(worker) if worker is not None else ""
+    cassette_file = os.path.basename(args.config).replace('.ini', '{}.jsonl.gz'.format(suffix))
+    return os.path.join(PROPERTIES.cassette_path, cassette_file)
+
+
+def _pytest_options(junit_file: str, allure_folder: str) -> List[str]:
+    return ["-m", "bat" if PROPERTIES.bat_only.lower() == "true" else "",
+            "-p", PYTEST_PLUGIN,
+            "--log-level", "DEBUG",
+            "--log-format", "# %(levelname)-8s [%(asctime)s] %(filename)-20s [LINE:%(lineno)s]   %(message)s",
+            "--log-date-format", "%Y-%m-%d %H:%M:%S",
+            "--junitxml={}".format(junit_file),
+            "--disable-pytest-warnings",
+            "--alluredir", allure_folder,
+            ]
+
+
+def run_tests(args: argparse.Namespace) -> int:
+    """
+    Run tests from PROPERTIES.test_path in current process
+
+    :param args: Parsed command line arguments
+    :return: Pytest exit code
+    """
+    timings = setup(args)
+    exit_code = pytest.main([PROPERTIES.test_path] +
+                            _pytest_options(r"{}\{}".format(PROPERTIES.report_path, PROPERTIES.report_file),
+                                            PROPERTIES.allure_report_folder))
+    teardown(timings, PROPERTIES.allure_report_folder)
+    return exit_code
+
+
+def run_load(args: argparse.Namespace):
+    """
+    Run load against API and write report next to junit report
+
+    :param args: Parsed command line arguments
+    :return: None
+    """
+    timings = setup(args)
+    report = load_runner.LoadRunner(PROPERTIES, mix=args.load_mix, rate=args.load_rate,
+                                    concurrency=args.load_concurrency, duration=args.load_duration).run()
+    load_runner.write_report(report, PROPERTIES.report_path, PROPERTIES.report_file)
+    teardown(timings, PROPERTIES.allure_report_folder)
+
+
+class _CollectPlugin:
+    """
+    Pytest plugin remembering ids of collected tests
+    """
+
+    def __init__(self):
+        self.node_ids = []
+
+    def pytest_collection_modifyitems(self, items):
+        self.node_ids = [item.nodeid for item in items]
+
+
+def collect_tests() -> List[str]:
+    """
+    Collect ids of tests from PROPERTIES.test_path
+
+    :return: List of test ids
+    """
+    plugin = _CollectPlugin()
+    pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider", "-p", PYTEST_PLUGIN,
+                 "-m", "bat" if PROPERTIES.bat_only.lower() == "true" else "", PROPERTIES.test_path],
+                plugins=[plugin])
+    return plugin.node_ids
+
+
+def shard_tests(node_ids: List[str], workers: int) -> List[List[str]]:
+    """
+    Split tests into shards. Tests of one module stay in one shard, so module fixtures
+    and dependencies between tests keep working
+
+    :param node_ids: Test ids
+    :param workers: Number of shards
+    :return: List of non-empty shards
+    """
+    modules = dict()
+    for node_id in node_ids:
+        modules.setdefault(node_id.split("::")[0], []).append(node_id)
+    shards = [[] for _ in range(workers)]
+    for module_tests in sorted(modules.values(), key=len, reverse=True):
+        min(shards, key=len).extend(module_tests)
+    return [shard for shard in shards if shard]
+
+
+def run_shard(args: argparse.Namespace, worker: int, node_ids: List[str]) -> Tuple[int, str, str]:
+    """
+    Run part of tests in worker process with own log, junit and allure files
+
+    :param args: Parsed command line arguments
+    :param worker: Number of worker
+    :param node_ids: Ids of tests to run
+    :return: Pytest exit code, path to junit report and path to allure results folder
+    """
+    suffix = "_w{}".format(worker)
+    logger.initialize(args.config, suffix, args.log_queue, args.log_queue_size)
+    logging.info("******************WORKER {} START: {} tests*******************".format(worker, len(node_ids)))
+    timings = setup(args, worker)
+    junit_file = os.path.join(PROPERTIES.report_path, PROPERTIES.report_file.replace('.xml', suffix + '.xml'))
+    allure_folder = PROPERTIES.allure_report_folder + suffix
+    exit_code = pytest.main(node_ids + _pytest_options(junit_file, allure_folder))
+    teardown(timings, allure_folder)
+    logging.info("******************WORKER {} FINISH******************".format(worker))
+    # Pool processes exit without atexit handlers, so queued log records are written here
+    logger.shutdown()
+    return int(exit_code), junit_file, allure_folder
+
+
+def merge_junit(junit_files: List[str], report_file: str):
+    """
+    Merge junit reports of workers into one test suite
+
+    :param junit_files: Paths to worker reports
+    :param report_file: Path to merged report
+    :return: None
+    """
+    merged = ElementTree.Element("testsuite", name="pytest")
+    counters = dict.fromkeys(("tests", "errors", "failures", "skipped"), 0)
+    duration = 0.0
+    for junit_file in junit_files:
+        if not os.path.exists(junit_file):
+            logging.warning("Junit report '{}' doesn't exist".format(junit_file))
+            continue
+        root = ElementTree.parse(junit_file).getroot()
+        for suite in root.iter("testsuite"):
+            for counter in counters:
+                counters[counter] += int(suite.get(counter, 0))
+            duration = max(duration, float(suite.get("time", 0)))
+            if "timestamp" in suite.attrib and "timestamp" not in merged.attrib:
+                merged.set("timestamp", suite.get("timestamp"))
+            merged.extend(suite.findall("testcase"))
+    for counter, value in counters.items():
+        merged.set(counter, str(value))
+    merged.set("time", "{:.3f}".format(duration))
+    testsuites = ElementTree.Element("testsuites")
+    testsuites.append(merged)
+    ElementTree.ElementTree(testsuites).write(report_file, encoding="utf-8", xml_declaration=True)
+
+
+def merge_cleanup(cleanup_files: List[str], report_file: str):
+    """
+    Merge cleanup reports of workers into one report. Workers that created nothing write no report
+
+    :param cleanup_files: Paths to worker cleanup reports
+    :param report_file: Path to merged report
+    :return: None
+    """
+    reports = []
+    for cleanup_file in cleanup_files:
+        if os.path.exists(cleanup_file):
+            with open(cleanup_file, 'r') as json_file:
+                reports.append(json.load(json_file))
+            os.remove(cleanup_file)
+    if not reports:
+        return
+    merged = {'duration': max(report['duration'] for report in reports),
+              'total': sum(report['total'] for report in reports),
+              'undone': sum(report['undone'] for report in reports),
+              'failed': sum(report['failed'] for report in reports),
+              'resources': [resource for report in reports for resource in report['resources']]}
+    with open(report_file, 'w') as json_file:
+        json.dump(merged, json_file, indent=4)
+
+
+def merge_allure(allure_folders: List[str], allure_folder: str):
+    """
+    Move allure results of workers into one folder
+
+    :param allure_folders: Worker result folders
+    :param allure_folder: Merged results folder
+    :return: None
+    """
+    os.makedirs(allure_folder, exist_ok=True)
+    for folder in allure_folders:
+        if not os.path.isdir(folder):
+            continue
+        for file_name in os.listdir(folder):
+            shutil.move(os.path.join(folder, file_name), os.path.join(allure_folder, file_name))
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def combine_exit_codes(exit_codes: List[int]) -> int:
+    """
+    Return one exit code for runs of many pytest sessions. Failure of any run wins over "no tests collected" (5)
+    of another run, and success of any run wins over 5
+
+    :param exit_codes: Pytest exit codes
+    :return: Highest exit code other than 0 and 5, otherwise 0 if any run passed, otherwise 5
+    """
+    failures = [exit_code for exit_code in exit_codes if exit_code not in (0, 5)]
+    if failures:
+        return max(failures)
+    return 0 if 0 in exit_codes else 5
+
+
+def run_parallel(args: argparse.Namespace) -> int:
+    """
+    Collect tests, run them in process pool and merge reports of workers into PROPERTIES.report_file
+
+    :param args: Parsed command line arguments
+    :return: Exit code of workers combined by combine_exit_codes
+    """
+    PropertyConfigurator.initialize(args.config, args.reuse)
+    PropertyConfigurator.setup()
+    node_ids = collect_tests()
+    shards = shard_tests(node_ids, args.workers)
+    logging.info("{} tests are split into {} shards".format(len(node_ids), len(shards)))
+    if not shards:
+        # Same exit code as pytest returns when no tests were collected
+        return 5
+    if (args.cassette or PROPERTIES.cassette_mode) == "off":
+        # Issues are seeded once here, otherwise every worker with empty snapshot would create its own
+        PropertyConfigurator.seeded_issues(GITHUB(PROPERTIES.github_url, PROPERTIES.github_token))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [executor.submit(run_shard, args, worker, shard) for worker, shard in enumerate(shards, 1)]
+        for future in futures:
+            results.append(future.result())
+
+    PropertyConfigurator.merge_workers(len(shards))
+    junit_files = [junit_file for _, junit_file, _ in results]
+    report_file = os.path.join(PROPERTIES.report_path, PROPERTIES.report_file)
+    merge_junit(junit_files, report_file)
+    for junit_file in junit_files:
+        if os.path.exists(junit_file):
+            os.remove(junit_file)
+    merge_cleanup([junit_file.replace('.xml', '_cleanup.json') for junit_file in junit_files],
+                  report_file.replace('.xml', '_cleanup.json'))
+    merge_allure([allure_folder for _, _, allure_folder in results], PROPERTIES.allure_report_folder)
+    cassette_mode = args.cassette or PROPERTIES.cassette_mode
+    if cassette_mode == "record":
+        Cassette.merge(_cassette_file(args), [_cassette_file(args, worker) for worker in range(1, len(shards) + 1)])
+    return combine_exit_codes([exit_code for exit_code, _, _ in results])
+
+
+def _configuration_path() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configuration")
+
+
+def matrix_configs(patterns: List[str]) -> List[str]:
+    """
+    Resolve config names and glob patterns relative to configuration folder
+
+    :param patterns: Config file names or patterns, e.g. ["config_*.ini"]
+    :return: Sorted config file names without duplicates
+    :raises ValueError: If pattern matches no config file
+    """
+    configs = []
+    for pattern in patterns:
+        matches = sorted(os.path.basename(path) for path in glob.glob(os.path.join(_configuration_path(), pattern)))
+        if not matches:
+            raise ValueError("No config files match '{}' in '{}'".format(pattern, _configuration_path()))
+        configs.extend(config for config in matches if config not in configs)
+    return configs
+
+
+def run_config(args: argparse.Namespace) -> Dict:
+    """
+    Run tests of one config in matrix process, in parallel workers if args.workers is above 1. Process is used
+    for one config only, so PROPERTIES, connection pool and logging state are not shared with other configs
+
+    :param args: Parsed command line arguments with config of this run
+    :return: Dictionary with config, pytest exit code, start, duration and junit report path
+    """
+    start = time.time()
+    logger.initialize(args.config, queue_mode=args.log_queue, queue_size=args.log_queue_size)
+    logging.info("******************START {}*******************".format(args.config))
+    try:
+        exit_code = int(run_parallel(args) if args.workers > 1 else run_tests(args))
+    except Exception as msg:
+        logging.exception("Run of config '{}' failed: {}".format(args.config, msg))
+        # Same exit code as pytest returns on internal error
+        exit_code = 3
+    logging.info("******************FINISH {}******************".format(args.config))
+    logger.shutdown()
+    report = r"{}\{}".format(getattr(PROPERTIES, 'report_path', ''), getattr(PROPERTIES, 'report_file', ''))
+    return {'config': args.config, 'exit_code': exit_code, 'start': start,
+            'duration': round(time.time() - start, 3), 'report': report}
+
+
+def _send_run(args: argparse.Namespace, connection: Connection):
+    connection.send(run_config(args))
+    connection.close()
+
+
+def _run_configs(cells: List[argparse.Namespace], processes: int) -> List[Dict]:
+    """
+    Run every config in new process, no more than given number at once. Processes are not daemonic,
+    so tests and parallel workers of the config can start processes of their own
+
+    :param cells: Parsed command line arguments with config of every run
+    :param processes: Max number of processes running at once
+    :return: Results of run_config in order of cells, exit code 3 for process that exited without result
+    """
+    pending = iter(enumerate(cells))
+    running = dict()
+    runs = [None] * len(cells)
+
+    def start_next():
+        for index, args in itertools.islice(pending, 1):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_send_run, args=(args, sender), name="matrix-" + args.config)
+            process.start()
+            sender.close()
+            running[receiver] = (index, args, process, time.time())
+
+    for _ in range(processes):
+        start_next()
+    while running:
+        for receiver in wait(list(running)):
+            index, args, process, start = running.pop(receiver)
+            try:
+                runs[index] = receiver.recv()
+            except EOFError:
+                pass
+            receiver.close()
+            process.join()
+            if runs[index] is None:
+                logging.error("Process of config '{}' exited with code {} without result".format(
+                    args.config, process.exitcode))
+                # Same exit code as pytest returns on internal error
+                runs[index] = {'config': args.config, 'exit_code': 3, 'start': start,
+                               'duration': round(time.time() - start, 3), 'report': ''}
+            start_next()
+    return runs
+
+
+def format_matrix(summary: Dict) -> str:
+    """
+    Format matrix summary as text table
+
+    :param summary: Summary returned by run_matrix
+    :return: Table with one row per config
+    """
+    header = "{:<40}{:>10}{:>12}".format("config", "exit code", "duration s")
+    lines = [header, "-" * len(header)]
+    for run in summary['configs']:
+        lines.append("{:<40}{:>10}{:>12.2f}".format(run['config'], run['exit_code'], run['duration']))
+    lines.append("-" * len(header))
+    lines.append("{} configs in {:.2f} s wall time, {:.2f} s sequential time".format(
+        len(summary['configs']), summary['wall_time'], summary['sequential_time']))
+    return "\n".join(lines)
+
+
+def run_matrix(args: argparse.Namespace) -> Dict:
+    """
+    Run tests of many configs at the same time, one new process per config, and write combined summary
+    to report_matrix.json and report_matrix.txt in report_path of --config. With --workers every config
+    runs its tests in that many parallel workers
+
+    :param args: Parsed command line arguments, args.matrix holds config names or patterns
+    :return: Summary with wall time and exit code and duration of every config
+    """
+    configs = matrix_configs(args.matrix)
+    processes = args.matrix_processes or len(configs)
+    logging.info("Matrix of {} configs is run in {} processes: {}".format(len(configs), processes, configs))
+
+    start = time.perf_counter()
+    runs = _run_configs([argparse.Namespace(**dict(vars(args), config=config)) for config in configs], processes)
+    summary = {'wall_time': round(time.perf_counter() - start, 3),
+               'sequential_time': round(sum(run['duration'] for run in runs), 3),
+               'exit_code': combine_exit_codes([run['exit_code'] for run in runs]), 'configs': runs}
+
+    report_path = get_property(os.path.join(_configuration_path(), args.config), "report_path")
+    os.makedirs(report_path, exist_ok=True)
+    with open(os.path.join(report_path, "report_matrix.json"), 'w') as json_file:
+        json.dump(summary, json_file, indent=4)
+    table = format_matrix(summary)
+    with open(os.path.join(report_path, "report_matrix.txt"), 'w') as table_file:
+        table_file.write(table + "\n")
+    logging.info("Matrix results\n{}".format(table))
+    return summary
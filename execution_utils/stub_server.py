@@ -0,0 +1,414 @@
+"""
+Local stand-in for GitHub REST API used to run and benchmark suites without network
+
+Run from the command line and point github_url in config.ini to it:
+
+    python -m execution_utils.stub_server --port 8000 --latency 0.05 --error-rate 0.01 --rate-limit 5000
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class StubState:
+    """
+    In-memory users, repositories, issues and branches of the stand-in server
+    """
+
+    def __init__(self, login: str = "stub-user", branches: Tuple[str, ...] = ("main", "demo")):
+        """
+        :param login: Login of user owning every token
+        :param branches: Branches every repository is created with
+        """
+        self.login = login
+        self.default_branches = branches
+        self.repos = dict()
+        self.lock = threading.Lock()
+
+    def repo(self, owner: str, name: str) -> Dict:
+        """
+        Return repository, create it on first access
+
+        :param owner: Repository owner
+        :param name: Repository name
+        :return: Dictionary with issues list and branches dictionary
+        """
+        key = (owner.lower(), name.lower())
+        if key not in self.repos:
+            self.repos[key] = {'issues': [],
+                               'branches': {branch: hashlib.sha1(branch.encode()).hexdigest()
+                                            for branch in self.default_branches}}
+        return self.repos[key]
+
+    def user(self) -> Dict:
+        """
+        Return user owning the token
+
+        :return: User dictionary
+        """
+        return {'login': self.login, 'id': 1, 'type': 'User', 'name': self.login, 'site_admin': False}
+
+
+class RateLimit:
+    """
+    Per-token request budget reported in X-RateLimit-* headers
+    """
+
+    def __init__(self, limit: int, window: int):
+        """
+        :param limit: Requests per window
+        :param window: Window length in seconds
+        """
+        self.limit = limit
+        self.window = window
+        self.budgets = dict()
+        self.lock = threading.Lock()
+
+    def consume(self, token: str, charge: bool = True) -> Tuple[bool, Dict[str, str]]:
+        """
+        Charge one request to token budget
+
+        :param token: Access token
+        :param charge: If False, budget is only checked and reported (e.g. for 304 responses)
+        :return: False if budget is exhausted, rate limit headers
+        """
+        with self.lock:
+            now = int(time.time())
+            used, reset = self.budgets.get(token, (0, now + self.window))
+            if now >= reset:
+                used, reset = 0, now + self.window
+            allowed = used < self.limit
+            if charge and allowed:
+                used += 1
+            self.budgets[token] = (used, reset)
+            return allowed, {'X-RateLimit-Limit': str(self.limit), 'X-RateLimit-Remaining': str(self.limit - used),
+                             'X-RateLimit-Used': str(used), 'X-RateLimit-Reset': str(reset)}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Request handler implementing endpoints used by github_sdk resources
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "GitHubStub/1.0"
+    # Headers and body are written separately, without TCP_NODELAY every kept-alive request waits for delayed ACK
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        ('GET', re.compile(r'^/user$'), 'get_user'),
+        ('GET', re.compile(r'^/repos/([^/]+)/([^/]+)/issues$'), 'list_issues'),
+        ('POST', re.compile(r'^/repos/([^/]+)/([^/]+)/issues$'), 'create_issue'),
+        ('GET', re.compile(r'^/repos/([^/]+)/([^/]+)/issues/(\d+)$'), 'get_issue'),
+        ('PATCH', re.compile(r'^/repos/([^/]+)/([^/]+)/issues/(\d+)$'), 'update_issue'),
+        ('GET', re.compile(r'^/repos/([^/]+)/([^/]+)/branches$'), 'list_branches'),
+        ('POST', re.compile(r'^/repos/([^/]+)/([^/]+)/branches/([^/]+)/rename$'), 'rename_branch'),
+    ]
+
+    def log_message(self, format, *args):
+        logging.debug("STUB: " + format % args)
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_HEAD(self):
+        self._send(200, None)
+
+    def do_POST(self):
+        self._dispatch()
+
+    def do_PATCH(self):
+        self._dispatch()
+
+    @property
+    def state(self) -> StubState:
+        return self.server.state
+
+    def _dispatch(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        config = self.server.config
+
+        if config['latency'] or config['jitter']:
+            time.sleep(config['latency'] + random.uniform(0, config['jitter']))
+
+        token = self.headers.get('Authorization', '').split(' ')[-1]
+        if config['token'] is not None and token != config['token']:
+            self._send(401, {'message': 'Bad credentials'})
+            return
+
+        if random.random() < config['error_rate']:
+            self._send(random.choice(config['error_statuses']), {'message': 'Injected error'})
+            return
+        if random.random() < config['secondary_rate']:
+            self._send(403, {'message': 'You have exceeded a secondary rate limit'},
+                       {'Retry-After': str(config['retry_after'])})
+            return
+
+        allowed, rate_headers = self.server.rate_limit.consume(token, charge=False)
+        if not allowed:
+            self._send(403, {'message': 'API rate limit exceeded'}, rate_headers)
+            return
+
+        for method, pattern, handler in self.ROUTES:
+            match = pattern.match(url.path)
+            if method == self.command and match:
+                break
+        else:
+            self._send(404, {'message': 'Not Found'}, self.server.rate_limit.consume(token)[1])
+            return
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            self._send(400, {'message': 'Problems parsing JSON'})
+            return
+
+        with self.state.lock:
+            status, payload, headers = getattr(self, handler)(*match.groups(), query=parse_qs(url.query), body=body)
+
+        etag = None
+        if self.command == 'GET' and status == 200:
+            etag = '"{}"'.format(hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest())
+            headers['ETag'] = etag
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            # Conditional requests answered with 304 are not charged
+            headers.update(rate_headers)
+            self._send(304, None, headers)
+            return
+
+        headers.update(self.server.rate_limit.consume(token)[1])
+        self._send(status, payload, headers)
+
+    def _send(self, status: int, payload, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _page(self, items: list, query: Dict, path: str) -> Tuple[list, Dict[str, str]]:
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = int(query.get('page', ['1'])[0])
+        headers = dict()
+        base = "http://{}:{}{}".format(*self.server.server_address[:2], path)
+        other = "&".join("{}={}".format(key, values[0]) for key, values in query.items()
+                         if key not in ('page', 'per_page'))
+        links = []
+        if page * per_page < len(items):
+            links.append('<{}?per_page={}&page={}{}>; rel="next"'.format(base, per_page, page + 1,
+                                                                         "&" + other if other else ""))
+            last = (len(items) + per_page - 1) // per_page
+            links.append('<{}?per_page={}&page={}{}>; rel="last"'.format(base, per_page, last,
+                                                                         "&" + other if other else ""))
+        if links:
+            headers['Link'] = ", ".join(links)
+        return items[(page - 1) * per_page:page * per_page], headers
+
+    def get_user(self, query: Dict, body: Dict):
+        return 200, self.state.user(), {}
+
+    def list_issues(self, owner: str, repo: str, query: Dict, body: Dict):
+        state = query.get('state', ['open'])[0]
+        issues = [issue for issue in self.state.repo(owner, repo)['issues'] if state in ('all', issue['state'])]
+        page, headers = self._page(issues, query, "/repos/{}/{}/issues".format(owner, repo))
+        return 200, page, headers
+
+    def create_issue(self, owner: str, repo: str, query: Dict, body: Dict):
+        if not body.get('title'):
+            return 422, {'message': 'Validation Failed', 'errors': [{'field': 'title', 'code': 'missing_field'}]}, {}
+        issues = self.state.repo(owner, repo)['issues']
+        number = len(issues) + 1
+        issue = {'number': number, 'title': body['title'], 'body': body.get('body'), 'state': 'open',
+                 'url': "/repos/{}/{}/issues/{}".format(owner, repo, number),
+                 'user': {'login': self.state.login},
+                 'assignees': [{'login': login} for login in body.get('assignees') or [] if login],
+                 'labels': [{'name': label} for label in body.get('labels') or [] if label]}
+        issues.append(issue)
+        return 201, issue, {}
+
+    def get_issue(self, owner: str, repo: str, number: str, query: Dict, body: Dict):
+        issues = self.state.repo(owner, repo)['issues']
+        if not 0 < int(number) <= len(issues):
+            return 404, {'message': 'Not Found'}, {}
+        return 200, issues[int(number) - 1], {}
+
+    def update_issue(self, owner: str, repo: str, number: str, query: Dict, body: Dict):
+        issues = self.state.repo(owner, repo)['issues']
+        if not 0 < int(number) <= len(issues):
+            return 404, {'message': 'Not Found'}, {}
+        issue = issues[int(number) - 1]
+        for field in ('title', 'body', 'state'):
+            if field in body:
+                issue[field] = body[field]
+        return 200, issue, {}
+
+    def list_branches(self, owner: str, repo: str, query: Dict, body: Dict):
+        branches = [{'name': name, 'commit': {'sha': sha}, 'protected': False}
+                    for name, sha in self.state.repo(owner, repo)['branches'].items()]
+        page, headers = self._page(branches, query, "/repos/{}/{}/branches".format(owner, repo))
+        return 200, page, headers
+
+    def rename_branch(self, owner: str, repo: str, branch: str, query: Dict, body: Dict):
+        branches = self.state.repo(owner, repo)['branches']
+        new_name = body.get('new_name')
+        if branch not in branches or not new_name or new_name in branches:
+            return 422, {'message': 'Validation Failed'}, {}
+        branches[new_name] = branches.pop(branch)
+        return 201, {'name': new_name,
+                     'commit': {'sha': branches[new_name], 'author': {'login': self.state.login},
+                                'committer': {'login': self.state.login}},
+                     'protected': False}, {}
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    """
+    Threading server with listen backlog big enough for hundreds of concurrent clients opening connections
+    """
+
+    request_queue_size = 128
+
+
+class StubServer:
+    """
+    Threaded stand-in server with configurable latency, injected errors and rate limits
+
+    :Example:
+
+    .. code-block:: python
+
+        from execution_utils.stub_server import StubServer
+        from github_sdk import GITHUB
+
+        with StubServer(latency=0.02, rate_limit=100) as server:
+            github_api = GITHUB(server.url, "any-token")
+            print(github_api.user.get_user().json["login"])
+            stub-user
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_statuses: Tuple[int, ...] = (502, 503),
+                 secondary_rate: float = 0.0, retry_after: int = 1, rate_limit: int = 5000,
+                 rate_limit_window: int = 3600, token: str = None, login: str = "stub-user",
+                 branches: Tuple[str, ...] = ("main", "demo")):
+        """
+        :param host: Interface to listen on
+        :param port: Port to listen on, 0 means any free port
+        :param latency: Delay in seconds added to every request
+        :param jitter: Max random delay in seconds added on top of latency
+        :param error_rate: Probability of answering with one of error_statuses
+        :param error_statuses: Status codes of injected errors
+        :param secondary_rate: Probability of answering with secondary rate limit 403 and Retry-After header
+        :param retry_after: Value of Retry-After header in seconds
+        :param rate_limit: Requests per token per window, exhausted budget is answered with 403
+        :param rate_limit_window: Rate limit window in seconds
+        :param token: If set, requests with other tokens are answered with 401
+        :param login: Login of user owning every token
+        :param branches: Branches every repository is created with
+        """
+        self._server = _ThreadingServer((host, port), StubHandler)
+        self._server.daemon_threads = True
+        self._server.state = StubState(login, branches)
+        self._server.rate_limit = RateLimit(rate_limit, rate_limit_window)
+        self._server.config = {'latency': latency, 'jitter': jitter, 'error_rate': error_rate,
+                               'error_statuses': error_statuses, 'secondary_rate': secondary_rate,
+                               'retry_after': retry_after, 'token': token}
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Return base URL of the server
+
+        :return: URL to pass to GITHUB as hostname
+        """
+        return "http://{}:{}".format(*self._server.server_address[:2])
+
+    @property
+    def state(self) -> StubState:
+        """
+        Return in-memory data of the server
+
+        :return: StubState object
+        """
+        return self._server.state
+
+    def start(self):
+        """
+        Start serving in background thread
+
+        :return: None
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info("STUB: GitHub stand-in server is listening on {}".format(self.url))
+
+    def serve_forever(self):
+        """
+        Serve in current thread until interrupted
+
+        :return: None
+        """
+        logging.info("STUB: GitHub stand-in server is listening on {}".format(self.url))
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """
+        Stop serving and close socket
+
+        :return: None
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for GitHub REST API")
+    parser.add_argument('--host', default="127.0.0.1", help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Delay in seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Max random delay added on top of latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of 502/503 response')
+    parser.add_argument('--secondary-rate', type=float, default=0.0,
+                        help='Probability of secondary rate limit response with Retry-After header')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='Requests per token per window')
+    parser.add_argument('--rate-limit-window', type=int, default=3600, help='Rate limit window in seconds')
+    parser.add_argument('--login', default="stub-user", help='Login of user owning every token')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = StubServer(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, secondary_rate=args.secondary_rate, rate_limit=args.rate_limit,
+                        rate_limit_window=args.rate_limit_window, login=args.login)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,10 @@
 from .github import GITHUB
+from .async_github import AsyncGITHUB
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .pool import SESSION_POOL, SessionPool
+from .cassette import Cassette, CassetteError
+from .timing import TimingCollector
+from .tracker import ResourceTracker
+from .responses.response import set_payload_logging
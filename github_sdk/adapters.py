@@ -0,0 +1,129 @@
+"""Transport adapters used by GITHUB sessions"""
+
+import contextlib
+import socket
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# Stack of connection phase timings of requests sent on current thread, the innermost request is on top.
+# Redirects are sent while outer request is still measured, so each request gets its own entry
+CONNECTION_TIMINGS = threading.local()
+PHASES = ('dns', 'connect', 'tls')
+
+
+@contextlib.contextmanager
+def connection_timings() -> Iterator[Dict[str, float]]:
+    """
+    Measure connection phases of request sent on current thread inside the block
+
+    :return: Dictionary with dns, connect (TCP) and tls seconds, filled when the block exits
+    """
+    timings = dict.fromkeys(PHASES, 0.0)
+    stack = CONNECTION_TIMINGS.__dict__.setdefault('stack', [])
+    stack.append(timings)
+    try:
+        yield timings
+    finally:
+        stack.pop()
+
+
+def _current() -> Optional[Dict[str, float]]:
+    stack = getattr(CONNECTION_TIMINGS, 'stack', None)
+    return stack[-1] if stack else None
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    HTTP connection measuring time of DNS lookup and TCP connect separately
+    """
+
+    def _new_conn(self) -> socket.socket:
+        timings = _current()
+        if timings is None:
+            return super()._new_conn()
+
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as msg:
+            raise NewConnectionError(self, "Failed to resolve '{}': {}".format(self.host, msg)) from msg
+        finally:
+            timings['dns'] += time.perf_counter() - start
+
+        # Resolved addresses are tried in order like urllib3 does, without resolving the name again
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address[4][0]
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+            timings['connect'] += time.perf_counter() - start
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    """
+    HTTPS connection measuring time of DNS lookup and TCP connect separately from TLS handshake
+    """
+
+    def connect(self):
+        timings = _current()
+        if timings is None:
+            super().connect()
+            return
+
+        start = time.perf_counter()
+        before = timings['dns'] + timings['connect']
+        try:
+            super().connect()
+        finally:
+            connect = timings['dns'] + timings['connect'] - before
+            timings['tls'] += max(time.perf_counter() - start - connect, 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    HTTP adapter with configurable TCP keep-alive of pooled connections and connection phase timings
+    """
+
+    def __init__(self, keep_alive_idle: int = None, **kwargs):
+        """
+        :param keep_alive_idle: Seconds of idle time before TCP keep-alive probes are sent. If None, OS default is used
+        :param kwargs: Arguments of ``requests.adapters.HTTPAdapter``
+        """
+        self._keep_alive_idle = keep_alive_idle
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        socket_options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if self._keep_alive_idle is not None and hasattr(socket, 'TCP_KEEPIDLE'):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self._keep_alive_idle))
+        kwargs['socket_options'] = socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                   'https': TimedHTTPSConnectionPool}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['_keep_alive_idle'] = self._keep_alive_idle
+        return state
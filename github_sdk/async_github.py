@@ -0,0 +1,51 @@
+"""Contains asyncio class for manipulating with GITHUB"""
+
+from .async_session import AsyncSession
+from .resources.user import AsyncUser
+from .resources.branch import AsyncBranch
+from .resources.issues import AsyncIssues
+
+
+class AsyncGITHUB:
+    """
+    GITHUB Class with asyncio resources sharing one connection pool.
+    Requests are sent by aiohttp and bypass layers of GithubSession and SESSION_POOL: they are not cached,
+    paced by rate limits, retried, recorded to or replayed from cassette, passed to request hooks
+    or tracked for cleanup. Use GITHUB object when any of these is needed
+
+    :Example:
+
+    .. code-block:: python
+
+        async with AsyncGITHUB("api.github.com", token) as github_api:
+            responses = await asyncio.gather(*[github_api.user.get_user() for _ in range(100)])
+    """
+
+    def __init__(self, hostname: str, token: str, limit: int = 100, limit_per_host: int = 0):
+        """
+        :param hostname: github hostname
+        :param token: access token
+        :param limit: Max number of requests in flight over the connection pool
+        :param limit_per_host: Max number of connections to one host, 0 means no limit
+        """
+        self.hostname = "https://{}".format(hostname.rstrip("/")) if not hostname.startswith("http") \
+            else hostname.rstrip("/")
+
+        self._rest_client = AsyncSession(limit=limit, limit_per_host=limit_per_host)
+        self.user = AsyncUser(self.hostname, token, self._rest_client)
+        self.branch = AsyncBranch(self.hostname, token, self._rest_client)
+        self.issues = AsyncIssues(self.hostname, token, self._rest_client)
+
+    async def close(self):
+        """
+        Close connection pool
+
+        :return: None
+        """
+        await self._rest_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
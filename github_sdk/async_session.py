@@ -0,0 +1,82 @@
+"""Pooled asyncio HTTP client shared by all async resources"""
+
+import asyncio
+import datetime
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncSession:
+    """
+    Lazily creates one ``aiohttp.ClientSession`` and returns server responses as ``requests.Response`` objects,
+    so async resources can hand back the same ``Response`` wrapper as the blocking ones
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 30,
+                 timeout: float = 300):
+        """
+        :param limit: Total number of simultaneous connections in the pool
+        :param limit_per_host: Number of simultaneous connections to one host, 0 means no limit
+        :param keepalive_timeout: Seconds to keep idle connection open
+        :param timeout: Total timeout of one request in seconds
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSession requires 'aiohttp' package to be installed")
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = timeout
+        self._session = None
+        self._lock = asyncio.Lock()
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host,
+                                                     keepalive_timeout=self._keepalive_timeout)
+                    self._session = aiohttp.ClientSession(connector=connector,
+                                                          timeout=aiohttp.ClientTimeout(total=self._timeout))
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+        Send request and read the whole body
+
+        :param method: HTTP method
+        :param url: Request URL
+        :param headers: Request headers
+        :param kwargs: Other arguments accepted by ``aiohttp.ClientSession.request``
+        :return: Server response
+        """
+        session = await self._get_session()
+        start = datetime.datetime.now()
+        async with session.request(method, url, headers=headers, **kwargs) as resp:
+            body = await resp.read()
+            response = requests.Response()
+            response.status_code = resp.status
+            response.reason = resp.reason
+            response.headers = CaseInsensitiveDict(resp.headers)
+            response.url = str(resp.url)
+            response.encoding = resp.charset
+            response._content = body
+            response._content_consumed = True
+            response.elapsed = datetime.datetime.now() - start
+            return response
+
+    async def close(self):
+        """
+        Close all pooled connections
+
+        :return: None
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
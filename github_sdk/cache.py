@@ -0,0 +1,170 @@
+"""Conditional request cache for GITHUB responses"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheEntry:
+    """
+    Cached body and validators of one response
+    """
+
+    __slots__ = ('etag', 'last_modified', 'status_code', 'headers', 'content', 'encoding', 'stored_at')
+
+    def __init__(self, response: requests.Response):
+        """
+        :param response: Server response with ETag or Last-Modified header
+        """
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.status_code = response.status_code
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.encoding = response.encoding
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """
+    LRU cache of GET responses revalidated with If-None-Match / If-Modified-Since.
+    304 responses are not counted against GitHub rate limit, so revalidation is much cheaper than refetching.
+    Streamed responses and requests with Cache-Control: no-store, e.g. pages of paginated listings, bypass the cache
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, ResponseCache
+
+        github_api = GITHUB("api.github.com", token, cache=ResponseCache(max_entries=512, ttl=600))
+        github_api.user.get_user()
+        github_api.user.get_user()  # served from cache after 304
+        print(github_api.cache.stats)
+        {'entries': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300):
+        """
+        :param max_entries: Max number of cached responses, least recently used are evicted first
+        :param ttl: Time in seconds after which entry is dropped and resource is fetched unconditionally
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(request: requests.PreparedRequest) -> tuple:
+        return request.url, request.headers.get('Authorization'), request.headers.get('accept')
+
+    def get(self, request: requests.PreparedRequest) -> Optional[CacheEntry]:
+        """
+        Return not expired entry for request
+
+        :param request: Prepared GET request
+        :return: Cache entry or None
+        """
+        key = self._key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def store(self, request: requests.PreparedRequest, response: requests.Response):
+        """
+        Store response if it has validators
+
+        :param request: Prepared GET request
+        :param response: Server response with 200 status code
+        :return: None
+        """
+        if 'ETag' not in response.headers and 'Last-Modified' not in response.headers:
+            return
+        with self._lock:
+            self._entries[self._key(request)] = CacheEntry(response)
+            self._entries.move_to_end(self._key(request))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def send(self, send: Callable[..., requests.Response], request: requests.PreparedRequest, **kwargs) \
+            -> requests.Response:
+        """
+        Send conditional request and return cached response on 304.
+        Streamed requests and requests with Cache-Control: no-store are sent as is and never stored
+
+        :param send: Function sending prepared request
+        :param request: Prepared request
+        :param kwargs: Arguments of ``requests.Session.send``
+        :return: Server or cached response
+        """
+        if request.method != 'GET' or kwargs.get('stream') or 'no-store' in request.headers.get('Cache-Control', ''):
+            return send(request, **kwargs)
+
+        entry = self.get(request)
+        if entry is not None:
+            if entry.etag:
+                request.headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request.headers['If-Modified-Since'] = entry.last_modified
+
+        response = send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.hits += 1
+            return self._from_entry(entry, response)
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.store(request, response)
+        return response
+
+    @staticmethod
+    def _from_entry(entry: CacheEntry, not_modified: requests.Response) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers.update({name: value for name, value in not_modified.headers.items()
+                                 if name.lower() not in ('content-length', 'transfer-encoding', 'content-encoding')})
+        response._content = entry.content
+        response._content_consumed = True
+        response.encoding = entry.encoding
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.connection = not_modified.connection
+        response.from_cache = True
+        return response
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters
+
+        :return: Dictionary with number of entries, hits, misses and evictions
+        """
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    def clear(self):
+        """
+        Drop all entries
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
@@ -1,10 +1,16 @@
 """Contains main class for manipulating with GITHUB"""
 
-import requests
+from typing import Callable
 
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .pool import SESSION_POOL
+from .session import GithubSession
 from .resources.user import User
 from .resources.branch import Branch
 from .resources.issues import Issues
+from .resources.graphql import GraphQL
 
 
 class GITHUB:
@@ -12,15 +18,41 @@ class GITHUB:
     GITHUB Class
     """
 
-    def __init__(self, hostname: str, token: str):
+    def __init__(self, hostname: str, token: str, cache: ResponseCache = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, shared_pool: bool = True):
         """
         :param hostname: github hostname
         :param token: access token
+        :param cache: Conditional request cache shared by all resources. If None, responses are not cached
+        :param rate_limiter: Scheduler pacing requests by X-RateLimit headers. Can be shared by several GITHUB
+            objects using the same token. If None, requests are not paced
+        :param retry_policy: Policy for resending requests failed with transient errors, applied to every resource
+            method. If None, requests are not retried
+        :param shared_pool: If True, requests are sent over connections pooled in SESSION_POOL for this hostname
+            and token. If False, GITHUB object opens own connections
         """
         self.hostname = "https://{}".format(hostname.rstrip("/")) if not hostname.startswith("http") \
             else hostname.rstrip("/")
 
-        self._rest_client = requests.Session()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        if shared_pool:
+            self._rest_client = SESSION_POOL.get_session(self.hostname, token, cache=cache, rate_limiter=rate_limiter,
+                                                         retry_policy=retry_policy)
+        else:
+            self._rest_client = GithubSession(cache=cache, rate_limiter=rate_limiter, retry_policy=retry_policy)
         self.user = User(self.hostname, token, self._rest_client)
         self.branch = Branch(self.hostname, token, self._rest_client)
         self.issues = Issues(self.hostname, token, self._rest_client)
+        self.graphql = GraphQL(self.hostname, token, self._rest_client)
+
+    def add_hook(self, event: str, callback: Callable):
+        """
+        Register callback for every request sent by resources of this object
+
+        :param event: before_request or after_response, see GithubSession.add_hook
+        :param callback: Function to call
+        :return: None
+        """
+        self._rest_client.add_hook(event, callback)
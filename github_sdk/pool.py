@@ -0,0 +1,157 @@
+"""Process-wide registry of HTTP connection pools shared by GITHUB objects"""
+
+import logging as log
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+from .adapters import PoolAdapter
+from .cassette import CassetteAdapter
+from .session import GithubSession, HOOK_EVENTS
+
+
+class SessionPool:
+    """
+    Registry of connection pools keyed by hostname and token. Every GITHUB object gets own session,
+    but sessions for the same hostname and token send requests over the same pooled connections,
+    so TLS handshake is paid once per run instead of once per test
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, SESSION_POOL
+
+        SESSION_POOL.configure(pool_maxsize=20, prewarm=4)
+        github_api = GITHUB("api.github.com", token)  # takes session from SESSION_POOL
+    """
+
+    def __init__(self):
+        # Requests above pool_maxsize wait for free connection, otherwise extra connections are opened
+        # and discarded after one request
+        self.settings = {'pool_connections': 10, 'pool_maxsize': 10, 'pool_block': True,
+                         'keep_alive': True, 'keep_alive_idle': None, 'prewarm': 0, 'cassette': None}
+        self.hooks = {event: [] for event in HOOK_EVENTS}
+        self._adapters = dict()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def add_hook(self, event: str, callback: Callable):
+        """
+        Register request hook on every session returned by get_session after this call
+
+        :param event: before_request or after_response, see GithubSession.add_hook
+        :param callback: Function to call
+        :return: None
+        :raises KeyError: If event is unknown
+        """
+        if event not in self.hooks:
+            raise KeyError("Unknown hook event '{}', expected one of {}".format(event, HOOK_EVENTS))
+        self.hooks[event].append(callback)
+
+    def configure(self, **settings):
+        """
+        Change settings of pools created after this call
+
+        :param settings: pool_connections - number of hosts to keep pools for,
+            pool_maxsize - max connections kept open per host,
+            pool_block - if True, pool_maxsize is hard limit of connections per host and requests wait for free one.
+            If False, connections above pool_maxsize are opened for one request and closed,
+            keep_alive - if False, connections are closed after each request,
+            keep_alive_idle - seconds of idle time before TCP keep-alive probes are sent,
+            prewarm - number of connections opened when pool is created,
+            cassette - Cassette to record interactions to or replay them from, None to use network only
+        :return: None
+        :raises KeyError: If setting is unknown
+        """
+        for name in settings:
+            if name not in self.settings:
+                raise KeyError("Unknown connection pool setting '{}'".format(name))
+        self.settings.update(settings)
+
+    def _get_adapter(self, hostname: str, token: str) -> Tuple[PoolAdapter, bool]:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections of parent process must not be shared with forked child
+                self._adapters = dict()
+                self._pid = os.getpid()
+            adapter = self._adapters.get((hostname, token))
+            if adapter is not None:
+                return adapter, False
+            adapter = PoolAdapter(keep_alive_idle=self.settings['keep_alive_idle'],
+                                  pool_connections=self.settings['pool_connections'],
+                                  pool_maxsize=self.settings['pool_maxsize'],
+                                  pool_block=self.settings['pool_block'])
+            self._adapters[(hostname, token)] = adapter
+            return adapter, True
+
+    def get_session(self, hostname: str, token: str, **kwargs) -> GithubSession:
+        """
+        Return new session sending requests over shared connection pool
+
+        :param hostname: Github URL
+        :param token: Access token
+        :param kwargs: Arguments of GithubSession, e.g. cache
+        :return: Session object
+        """
+        adapter, created = self._get_adapter(hostname, token)
+        if self.settings['cassette'] is not None:
+            adapter = CassetteAdapter(self.settings['cassette'], adapter)
+        session = GithubSession(**kwargs)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.settings['keep_alive']:
+            session.headers['Connection'] = 'close'
+        if created and self.settings['prewarm'] and self.settings['cassette'] is None:
+            self.prewarm(session, hostname, self.settings['prewarm'])
+        for event, callbacks in self.hooks.items():
+            for callback in callbacks:
+                session.add_hook(event, callback)
+        return session
+
+    @staticmethod
+    def prewarm(session: GithubSession, hostname: str, connections: int):
+        """
+        Open connections in advance by sending parallel HEAD requests
+
+        :param session: Session mounted to the pool
+        :param hostname: Github URL
+        :param connections: Number of connections to open
+        :return: None
+        """
+        def head(_):
+            try:
+                session.head(hostname, timeout=10)
+            except Exception as msg:
+                log.warning("GITHUB: Could not prewarm connection to '{}': {}".format(hostname, msg))
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(head, range(connections)))
+        log.debug("GITHUB: {} connections to '{}' were prewarmed".format(connections, hostname))
+
+    def close(self):
+        """
+        Close all pooled connections
+
+        :return: None
+        """
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters = dict()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return number of open connection pools per hostname
+
+        :return: Dictionary with hostnames and number of pools
+        """
+        stats = dict()
+        for hostname, _ in self._adapters:
+            stats[hostname] = stats.get(hostname, 0) + 1
+        return stats
+
+
+SESSION_POOL = SessionPool()
@@ -1,8 +1,11 @@
 """User resource"""
 
+from typing import Dict, Iterator
+
 from requests import Session
 
-from github_sdk.resources.resource import Resource
+from github_sdk.resources.resource import Resource, AsyncResource
+from ..async_session import AsyncSession
 from ..responses.response import Response
 
 
@@ -28,3 +31,50 @@ class Branch(Resource):
         json_body = {'new_name': rename_branch}
         resp = self._rest_client.post(api_url, json=json_body, headers=self.headers)
         return Response(resp)
+
+    def get_archive(self, owner: str, repo: str, branch: str, archive_format: str = 'tarball') -> Response:
+        """
+        Download archive of the branch. Body is streamed, use Response.save_to or Response.iter_bytes to read it
+        :param owner: Owner of the name
+        :param repo: Repo of the name
+        :param branch: Branch name
+        :param archive_format: tarball or zipball
+        :return: Response object
+        """
+        api_url = f'{self.base}/{owner}/{repo}/{archive_format}/{branch}'
+        resp = self._rest_client.get(api_url, headers=self.headers, stream=True)
+        return Response(resp)
+
+    def iter_branches(self, owner: str, repo: str, per_page: int = 100) -> Iterator[Dict]:
+        """
+        Iterate over all branches of the repository without loading them into memory at once
+        :param owner: Owner of the name
+        :param repo: Repo of the name
+        :param per_page: The number of results per page (max 100)
+        :return: Generator of branches dictionaries
+        """
+        api_url = f'{self.base}/{owner}/{repo}/branches'
+        return self._paginate(api_url, params={'per_page': per_page})
+
+
+class AsyncBranch(AsyncResource):
+    """Class for branch resource with asyncio methods"""
+
+    def __init__(self, hostname: str,
+                 token: str,
+                 rest_client: AsyncSession):
+        super().__init__(hostname, rest_client, token)
+        self.base = f"{hostname}/repos"
+
+    async def rename_branch(self, owner, repo, branch, rename_branch) -> Response:
+        """
+        Rename the branch from Github
+        :param owner: Owner of the name
+        :param repo: Repo of the name
+        :param branch: Branch name to be rename
+        :param rename_branch: Rename the branch
+        :return: Response object
+        """
+        api_url = f'{self.base}/{owner}/{repo}/branches/{branch}/rename'
+        json_body = {'new_name': rename_branch}
+        return await self._request("POST", api_url, json=json_body)
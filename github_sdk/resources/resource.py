@@ -2,17 +2,89 @@
 Base resource
 """
 
+import logging as log
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator
+
 from requests import Session
 
+from ..async_session import AsyncSession
+from ..responses.response import Response
+
 
-class Resource:
+class BaseResource:
     """
-    Base class for all resources
+    Headers and client shared by blocking and asyncio resources
     """
 
-    def __init__(self, hostname: str, rest_client: Session, token: str):
+    def __init__(self, hostname: str, rest_client: Any, token: str):
         self.hostname = hostname
         self.headers = {'content-type': 'application/json',
                         'accept': 'application/vnd.github.v3+json',
                         'Authorization': f'token {token}'}
         self._rest_client = rest_client
+
+
+class Resource(BaseResource):
+    """
+    Base class for all resources
+    """
+
+    def __init__(self, hostname: str, rest_client: Session, token: str):
+        super().__init__(hostname, rest_client, token)
+
+    def add_hook(self, event: str, callback: Callable):
+        """
+        Register request hook on session shared by this resource and other resources of the same GITHUB object
+
+        :param event: before_request or after_response, see GithubSession.add_hook
+        :param callback: Function to call
+        :return: None
+        """
+        self._rest_client.add_hook(event, callback)
+
+    def _paginate(self, url: str, params: Dict = None) -> Iterator[Dict]:
+        """
+        Iterate over items of list endpoint page by page following Link: rel="next" headers.
+        Next page is downloaded in background while items of current page are consumed,
+        so only two pages are held in memory at once
+
+        :param url: URL of the first page
+        :param params: Query parameters of the first page. Next pages URLs already contain them
+        :return: Generator of items
+        :raises requests.HTTPError: If any page could not be received
+        """
+        # Pages are not kept by response cache, otherwise memory grows with size of the listing
+        headers = dict(self.headers, **{'Cache-Control': 'no-store'})
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(self._rest_client.get, url, params=params, headers=headers)
+            while next_page is not None:
+                page = Response(next_page.result())
+                if page.status_code != 200:
+                    log.error("GITHUB: Could not get page '{}', status code {}".format(page.url, page.status_code))
+                    page.response.raise_for_status()
+                next_url = page.links.get('next')
+                next_page = executor.submit(self._rest_client.get, next_url, headers=headers) \
+                    if next_url else None
+                yield from page.json
+
+
+class AsyncResource(BaseResource):
+    """
+    Base class for all asyncio resources. Requests go straight to the aiohttp pool of AsyncSession
+    """
+
+    def __init__(self, hostname: str, rest_client: AsyncSession, token: str):
+        super().__init__(hostname, rest_client, token)
+
+    async def _request(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send request through the shared async connection pool
+
+        :param method: HTTP method
+        :param url: Request URL
+        :param kwargs: Other request arguments, e.g. json
+        :return: Response object
+        """
+        resp = await self._rest_client.request(method, url, headers=self.headers, **kwargs)
+        return Response(resp)
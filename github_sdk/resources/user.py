@@ -2,7 +2,8 @@
 
 from requests import Session
 
-from github_sdk.resources.resource import Resource
+from github_sdk.resources.resource import Resource, AsyncResource
+from ..async_session import AsyncSession
 from ..responses.response import Response
 
 
@@ -20,3 +21,18 @@ class User(Resource):
         """
         resp = self._rest_client.get(self.url, headers=self.headers)
         return Response(resp)
+
+
+class AsyncUser(AsyncResource):
+    """Class for user resource with asyncio methods"""
+
+    def __init__(self, hostname: str, token: str, rest_client: AsyncSession):
+        super().__init__(hostname, rest_client, token)
+        self.url = f"{hostname}/user"
+
+    async def get_user(self) -> Response:
+        """
+        Get user from Github
+        :return: Response object
+        """
+        return await self._request("GET", self.url)
@@ -0,0 +1,68 @@
+"""
+Module for response of one lookup from batched GraphQL query
+"""
+
+import json
+from typing import Dict, List
+
+import requests
+
+from .response import Response, _field
+
+
+class GraphQLResponse(Response):
+    """
+    Class for result of one aliased lookup from GraphQL batch. Status code, headers and URL are shared
+    with the whole batch, json and content contain only data of this lookup
+    """
+
+    __slots__ = ('alias', '_data', 'errors')
+
+    def __init__(self, response: requests.Response, alias: str, data, errors: List[Dict]):
+        """
+        :param response: Server's response to the whole batch
+        :param alias: Alias of the lookup in batch
+        :param data: Data of the lookup
+        :param errors: GraphQL errors related to the lookup
+        """
+        super().__init__(response)
+        self.alias = alias
+        self._data = data
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        """
+        Return True if request succeeded and lookup has no errors
+
+        :return: Status of the lookup
+        """
+        return self.status_code == 200 and not self.errors and self._data is not None
+
+    @property
+    def content(self) -> str:
+        """
+        Return data of the lookup as string
+
+        :return: Content of the lookup
+        """
+        return json.dumps(self._data)
+
+    @property
+    def json(self):
+        """
+        Return data of the lookup
+
+        :return: Content of the lookup
+        """
+        return self._data
+
+    def get_field(self, *keys: str, default=None):
+        """
+        Return one field of the lookup data
+
+        :param keys: Name of the field or path to nested field
+        :param default: Value returned if field doesn't exist
+        :return: Field value
+        """
+        return _field(self._data, keys, default)
@@ -0,0 +1,133 @@
+"""Retry policy for transient GITHUB failures"""
+
+import logging as log
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable
+
+import requests
+
+# Request header with which resource methods mark request as safe (true) or unsafe (false) to resend.
+# GithubSession removes it before the request is sent
+IDEMPOTENT_HEADER = 'X-Github-Sdk-Idempotent'
+
+
+class RetryPolicy:
+    """
+    Resends requests failed with transient status codes or connection errors using exponential backoff
+    with full jitter. Only safe and idempotent methods are retried by default. Resource methods decide
+    per request whether it is safe to resend by IDEMPOTENT_HEADER, e.g. ``close_issue`` is always retried and
+    ``create_issues`` only when it is called with idempotent=True, so other POST requests like branch rename
+    stay unretried
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, RetryPolicy
+
+        # retry GET/PUT/DELETE... only
+        github_api = GITHUB("api.github.com", token, retry_policy=RetryPolicy())
+
+        # retry this issue creation too, duplicate issue is acceptable
+        github_api = GITHUB("api.github.com", token, retry_policy=RetryPolicy(total_timeout=120))
+        github_api.issues.create_issues(owner, repo, "Title", "Body", owner, "bug", idempotent=True)
+        print(github_api.retry_policy.stats)
+        {'retries': 2, 'gave_up': 0, 'reasons': {'503': 1, 'ConnectionError': 1}}
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 4, backoff: float = 0.5, max_backoff: float = 30,
+                 total_timeout: float = 60, statuses: Iterable[int] = RETRY_STATUSES,
+                 methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 on_retry: Callable[[requests.PreparedRequest, int, float, str], None] = None):
+        """
+        :param max_attempts: Max number of attempts including the first one
+        :param backoff: Base delay in seconds, delay before attempt N is random value in [0, backoff * 2 ** N]
+        :param max_backoff: Max delay in seconds between two attempts
+        :param total_timeout: Time budget in seconds for all attempts of one request. No retry is started
+            if it would end after the budget is spent
+        :param statuses: Status codes which are retried
+        :param methods: HTTP methods which are retried unless the request is marked otherwise
+        :param on_retry: Metric callback called with request, number of failed attempt, delay and reason
+            before each retry
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.total_timeout = total_timeout
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.on_retry = on_retry
+        self.retries = 0
+        self.gave_up = 0
+        self.reasons = Counter()
+        self._lock = threading.Lock()
+
+    def _delay(self, attempt: int, response: requests.Response = None) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def send(self, send: Callable[..., requests.Response], request: requests.PreparedRequest,
+             idempotent: bool = None, **kwargs) -> requests.Response:
+        """
+        Send request and resend it on transient failures
+
+        :param send: Function sending prepared request
+        :param request: Prepared request
+        :param idempotent: True if request is safe to resend, False if it is not.
+            If None, request is retried if its method is one of policy methods
+        :param kwargs: Arguments of ``requests.Session.send``
+        :return: Server response
+        :raises requests.ConnectionError: If connection error persists after all attempts
+        """
+        if not (request.method in self.methods if idempotent is None else idempotent):
+            return send(request, **kwargs)
+
+        deadline = time.monotonic() + self.total_timeout
+        attempt = 1
+        while True:
+            response = None
+            try:
+                response = send(request, **kwargs)
+                if response.status_code not in self.statuses:
+                    return response
+                reason = str(response.status_code)
+            except (requests.ConnectionError, requests.Timeout) as msg:
+                error = msg
+                reason = type(msg).__name__
+            delay = self._delay(attempt, response)
+            if attempt >= self.max_attempts or time.monotonic() + delay > deadline:
+                with self._lock:
+                    self.gave_up += 1
+                if response is not None:
+                    return response
+                raise error
+            with self._lock:
+                self.retries += 1
+                self.reasons[reason] += 1
+            log.warning("GITHUB: {} {} failed with {}, retry {} in {:.2f} seconds".format(
+                request.method, request.url, reason, attempt, delay))
+            if self.on_retry is not None:
+                self.on_retry(request, attempt, delay, reason)
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    @property
+    def stats(self) -> Dict:
+        """
+        Return retry counters
+
+        :return: Dictionary with number of retries, number of requests failed after all attempts
+            and number of retries per reason
+        """
+        return {'retries': self.retries, 'gave_up': self.gave_up, 'reasons': dict(self.reasons)}
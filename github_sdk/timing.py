@@ -0,0 +1,172 @@
+"""Collector of per-endpoint request timings"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Dict
+
+import requests
+
+# Upper bounds of latency histogram buckets in milliseconds, the last bucket has no upper bound
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+PHASES = ('dns', 'connect', 'tls', 'server', 'download', 'total')
+
+
+class EndpointStats:
+    """
+    Aggregated timings of one endpoint
+    """
+
+    __slots__ = ('count', 'errors', 'histogram', 'phases', 'min', 'max', 'request_bytes', 'response_bytes',
+                 'new_connections', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.min = None
+        self.max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.new_connections = 0
+        self.statuses = dict()
+
+    def add(self, timing: Dict):
+        total_ms = timing['total'] * 1000
+        self.count += 1
+        self.histogram[bisect_left(BUCKETS_MS, total_ms)] += 1
+        for phase in PHASES:
+            self.phases[phase] += timing[phase]
+        self.min = total_ms if self.min is None else min(self.min, total_ms)
+        self.max = max(self.max, total_ms)
+        self.request_bytes += timing['request_bytes']
+        self.response_bytes += timing['response_bytes'] or 0
+        if timing['connect']:
+            self.new_connections += 1
+        status = str(timing['status_code'] or timing['error'])
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if timing['error'] or timing['status_code'] >= 400:
+            self.errors += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return upper bound of histogram bucket containing given percentile
+
+        :param percent: Percentile, e.g. 95
+        :return: Latency in milliseconds
+        """
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return float(BUCKETS_MS[index]) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'errors': self.errors, 'statuses': self.statuses,
+                'min_ms': round(self.min or 0.0, 2), 'max_ms': round(self.max, 2),
+                'p50_ms': self.percentile(50), 'p95_ms': self.percentile(95), 'p99_ms': self.percentile(99),
+                'avg_ms': {phase: round(total * 1000 / self.count, 2) for phase, total in self.phases.items()},
+                'new_connections': self.new_connections, 'request_bytes': self.request_bytes,
+                'response_bytes': self.response_bytes,
+                'histogram_ms': {('<={}'.format(bound) if index < len(BUCKETS_MS) else '>{}'.format(BUCKETS_MS[-1])):
+                                 count for index, (bound, count) in
+                                 enumerate(zip(BUCKETS_MS + (None,), self.histogram)) if count}}
+
+
+class TimingCollector:
+    """
+    Keeps latency histograms per endpoint in memory and exports them to Allure results
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, TimingCollector
+
+        collector = TimingCollector()
+        github_api = GITHUB("api.github.com", token)
+        github_api.add_hook("after_response", collector.record)
+        github_api.user.get_user()
+        print(collector.stats["GET /user"]["p95_ms"])
+        collector.export_allure("reports/allure/report")
+    """
+
+    def __init__(self):
+        self._endpoints = dict()
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, timing: Dict):
+        """
+        Hook for after_response event
+
+        :param request: Sent request
+        :param response: Server response or None
+        :param timing: Timings of the request
+        :return: None
+        """
+        with self._lock:
+            stats = self._endpoints.get(timing['endpoint'])
+            if stats is None:
+                stats = self._endpoints[timing['endpoint']] = EndpointStats()
+            stats.add(timing)
+
+    @property
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Return statistics per endpoint
+
+        :return: Dictionary with endpoints and their counters, percentiles, average phase timings and histograms
+        """
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in sorted(self._endpoints.items())}
+
+    def format_table(self) -> str:
+        """
+        Format statistics as text table
+
+        :return: Table with one row per endpoint
+        """
+        header = "{:<56}{:>7}{:>7}{:>9}{:>9}{:>9}{:>9}{:>9}{:>9}{:>9}".format(
+            "endpoint", "count", "errors", "p50 ms", "p95 ms", "dns", "connect", "tls", "server", "download")
+        lines = [header, "-" * len(header)]
+        for endpoint, stats in self.stats.items():
+            lines.append("{:<56}{:>7}{:>7}{:>9.1f}{:>9.1f}{:>9.1f}{:>9.1f}{:>9.1f}{:>9.1f}{:>9.1f}".format(
+                endpoint, stats['count'], stats['errors'], stats['p50_ms'], stats['p95_ms'],
+                stats['avg_ms']['dns'], stats['avg_ms']['connect'], stats['avg_ms']['tls'], stats['avg_ms']['server'],
+                stats['avg_ms']['download']))
+        return "\n".join(lines)
+
+    def export_allure(self, allure_dir: str) -> str:
+        """
+        Write statistics into Allure results directory as separate result with json and text attachments
+
+        :param allure_dir: Allure results directory, e.g. PROPERTIES.allure_report_folder
+        :return: Path to written result file
+        """
+        os.makedirs(allure_dir, exist_ok=True)
+        json_source = "{}-attachment.json".format(uuid.uuid4())
+        with open(os.path.join(allure_dir, json_source), 'w') as json_file:
+            json.dump(self.stats, json_file, indent=4)
+        table_source = "{}-attachment.txt".format(uuid.uuid4())
+        with open(os.path.join(allure_dir, table_source), 'w') as table_file:
+            table_file.write(self.format_table() + "\n")
+
+        result_uuid = str(uuid.uuid4())
+        result = {'name': "API request timings", 'status': "passed", 'uuid': result_uuid,
+                  'fullName': "github_sdk#request_timings", 'historyId': "github_sdk_request_timings",
+                  'start': int(self.started * 1000), 'stop': int(time.time() * 1000),
+                  'attachments': [{'name': "timings.json", 'source': json_source, 'type': "application/json"},
+                                  {'name': "timings.txt", 'source': table_source, 'type': "text/plain"}],
+                  'labels': [{'name': "parentSuite", 'value': "github_sdk"},
+                             {'name': "suite", 'value': "timings"}]}
+        result_path = os.path.join(allure_dir, "{}-result.json".format(result_uuid))
+        with open(result_path, 'w') as result_file:
+            json.dump(result, result_file)
+        return result_path
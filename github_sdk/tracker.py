@@ -0,0 +1,148 @@
+"""Tracker of resources created or changed by requests, undoing them in one concurrent sweep"""
+
+import json
+import logging as log
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from urllib.parse import unquote
+
+import requests
+
+_CREATE_ISSUE = re.compile(r'/repos/([^/]+)/([^/]+)/issues$')
+_RENAME_BRANCH = re.compile(r'/repos/([^/]+)/([^/]+)/branches/([^/]+)/rename$')
+
+
+class ResourceTracker:
+    """
+    Remembers issues created and branches renamed over hooked sessions and undoes them: closes issues
+    and renames branches back to their original names. Several renames of one branch are collapsed,
+    so only one request per branch is sent
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, SESSION_POOL, RateLimiter, ResourceTracker
+
+        tracker = ResourceTracker()
+        SESSION_POOL.add_hook("after_response", tracker.record)
+        ...
+        report = tracker.sweep(GITHUB("api.github.com", token, rate_limiter=RateLimiter()))
+        tracker.write_report(report, "reports/report_cleanup.json")
+    """
+
+    def __init__(self):
+        self._issues = []
+        # (owner, repo) -> {current branch name: original branch name}
+        self._branches = dict()
+        self._lock = threading.Lock()
+        self.recording = True
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, timing: Dict):
+        """
+        Hook for after_response event
+
+        :param request: Sent request
+        :param response: Server response or None
+        :param timing: Timings of the request
+        :return: None
+        """
+        if not self.recording or response is None or response.status_code != 201 or request.method != 'POST':
+            return
+        path = requests.utils.urlparse(request.url).path.rstrip('/')
+
+        match = _CREATE_ISSUE.search(path)
+        if match:
+            try:
+                number = response.json()['number']
+            except (ValueError, KeyError, TypeError) as msg:
+                log.warning("GITHUB: Created issue is not tracked, number is not found in response: {}".format(msg))
+                return
+            with self._lock:
+                self._issues.append((match.group(1), match.group(2), number))
+            return
+
+        match = _RENAME_BRANCH.search(path)
+        if match:
+            old_name = unquote(match.group(3))
+            new_name = json.loads(request.body)['new_name']
+            with self._lock:
+                renames = self._branches.setdefault((match.group(1), match.group(2)), dict())
+                original = renames.pop(old_name, old_name)
+                if new_name != original:
+                    renames[new_name] = original
+
+    @property
+    def pending(self) -> int:
+        """
+        Return number of changes to undo
+
+        :return: Number of issues and branches
+        """
+        with self._lock:
+            return len(self._issues) + sum(len(renames) for renames in self._branches.values())
+
+    def sweep(self, github_api, concurrency: int = 8) -> Dict:
+        """
+        Undo all tracked changes concurrently. Recording is stopped, so requests of the sweep are not tracked.
+        Pass GITHUB object with RateLimiter to keep the sweep within rate limits
+
+        :param github_api: GITHUB object used to send requests
+        :param concurrency: Number of requests sent in parallel
+        :return: Report with duration, counters and result of every undo action
+        """
+        self.recording = False
+        with self._lock:
+            issues, self._issues = self._issues, []
+            branches, self._branches = self._branches, dict()
+
+        actions = [('issue', {'owner': owner, 'repo': repo, 'number': number},
+                    lambda owner=owner, repo=repo, number=number: github_api.issues.close_issue(owner, repo, number))
+                   for owner, repo, number in issues]
+        actions += [('branch', {'owner': owner, 'repo': repo, 'branch': current, 'original': original},
+                     lambda owner=owner, repo=repo, current=current, original=original:
+                     github_api.branch.rename_branch(owner, repo, current, original))
+                    for (owner, repo), renames in branches.items() for current, original in renames.items()]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self._undo, actions))
+        report = {'duration': round(time.perf_counter() - start, 3), 'total': len(results),
+                  'undone': sum(1 for result in results if result['status'] == 'undone'),
+                  'failed': sum(1 for result in results if result['status'] == 'failed'),
+                  'resources': results}
+        log.info("GITHUB: Cleanup undid {} of {} changes in {} seconds".format(report['undone'], report['total'],
+                                                                              report['duration']))
+        return report
+
+    @staticmethod
+    def _undo(action) -> Dict:
+        kind, resource, undo = action
+        result = dict(resource, kind=kind)
+        try:
+            resp = undo()
+            result['status_code'] = resp.status_code
+            result['status'] = 'undone' if resp.status_code < 400 else 'failed'
+        except Exception as msg:
+            log.error("GITHUB: Exception occurred: {}".format(msg))
+            result['status'] = 'failed'
+            result['error'] = str(msg)
+        return result
+
+    @staticmethod
+    def write_report(report: Dict, report_file: str) -> str:
+        """
+        Write cleanup report as json
+
+        :param report: Report returned by sweep
+        :param report_file: Path to json file
+        :return: Path to json file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(report_file)), exist_ok=True)
+        with open(report_file, 'w') as json_file:
+            json.dump(report, json_file, indent=4)
+        return report_file
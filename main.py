@@ -1,29 +1,23 @@
 import logging
-import pytest
+import sys
 
 
-from execution_utils import argument_parser, logger
-from execution_utils.configurators.property_configurator import PropertyConfigurator, PROPERTIES
+from execution_utils import argument_parser, logger, runner
 
-args = argument_parser.parse_args()
-logger.initialize(args.config)
 
+if __name__ == "__main__":
+    args = argument_parser.parse_args()
+    logger.initialize(args.config, queue_mode=args.log_queue, queue_size=args.log_queue_size)
 
-def setup():
-    PropertyConfigurator.initialize(args.config)
-    PropertyConfigurator.setup()
-
-
-logging.info("******************START*******************")
-setup()
-pytest.main(["-m", "bat" if PROPERTIES.bat_only.lower() == "true" else "",
-             PROPERTIES.test_path,
-             "--log-level", "DEBUG",
-             "--log-format", "# %(levelname)-8s [%(asctime)s] %(filename)-20s [LINE:%(lineno)s]   %(message)s",
-             "--log-date-format", "%Y-%m-%d %H:%M:%S",
-             r"--junitxml={}\{}".format(PROPERTIES.report_path, PROPERTIES.report_file),
-             "--disable-pytest-warnings",
-             r"--alluredir", PROPERTIES.allure_report_folder,
-             ])
-
-logging.info("******************FINISH******************")
+    logging.info("******************START*******************")
+    exit_code = 0
+    if args.load:
+        runner.run_load(args)
+    elif args.matrix:
+        exit_code = runner.run_matrix(args)['exit_code']
+    elif args.workers > 1:
+        exit_code = runner.run_parallel(args)
+    else:
+        exit_code = runner.run_tests(args)
+    logging.info("******************FINISH******************")
+    sys.exit(int(exit_code))
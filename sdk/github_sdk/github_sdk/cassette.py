@@ -0,0 +1,305 @@
+"""Record/replay of HTTP interactions for offline runs"""
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging as log
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict, deque
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Bodies up to this size are kept in memory while recorded, larger ones are spooled to temporary file
+# and written to cassette in chunks
+_SPOOL_SIZE = 1024 * 1024
+# Multiple of 3 bytes, so base64 of every chunk can be joined without padding in between
+_BASE64_CHUNK = 3 * 64 * 1024
+
+
+class CassetteError(Exception):
+    """
+    Exception related to cassette replay
+    """
+    pass
+
+
+class _TeeRaw:
+    """
+    Raw response wrapper copying body chunks to temporary file as the caller reads them. The file
+    is passed to callback once the body is read to the end
+    """
+
+    def __init__(self, raw, callback: Callable[[BinaryIO], None]):
+        """
+        :param raw: Raw response of urllib3
+        :param callback: Function called with file containing the whole body
+        """
+        self._raw = raw
+        self._callback = callback
+        self._body = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+
+    def stream(self, *args, **kwargs) -> Iterator[bytes]:
+        for chunk in self._raw.stream(*args, **kwargs):
+            self._body.write(chunk)
+            yield chunk
+        self._finish()
+
+    def read(self, amt: int = None, *args, **kwargs) -> bytes:
+        chunk = self._raw.read(amt, *args, **kwargs)
+        if chunk:
+            self._body.write(chunk)
+        if amt is None or not chunk:
+            self._finish()
+        return chunk
+
+    def _finish(self):
+        if self._callback is not None:
+            callback, self._callback = self._callback, None
+            with self._body:
+                callback(self._body)
+
+    def close(self):
+        self._body.close()
+        self._raw.close()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class Cassette:
+    """
+    Request/response pairs stored in gzip-compressed json lines file.
+    In record mode every interaction is written to temporary file next to the cassette once its body
+    is read to the end, and save() moves the file to cassette path. Bodies above 1 MiB are spooled to disk
+    while the caller reads them, so recording doesn't hold large downloads in memory.
+    Response closed before its body was read to the end is not recorded.
+    In replay mode the cassette is loaded into memory and responses are served without network,
+    identical requests are answered in recorded order
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import SESSION_POOL, Cassette
+
+        SESSION_POOL.configure(cassette=Cassette("resources/cassettes/config.jsonl.gz", mode="record"))
+        ...
+        SESSION_POOL.settings['cassette'].save()
+    """
+
+    MODES = ('record', 'replay')
+
+    def __init__(self, path: str, mode: str = 'replay', strict: bool = True):
+        """
+        :param path: Path to cassette file
+        :param mode: record or replay
+        :param strict: In replay mode, if True, request without recorded response raises CassetteError.
+            If False, such request is sent to the server
+        :raises CassetteError: If mode is unknown or cassette to replay doesn't exist
+        """
+        if mode not in self.MODES:
+            raise CassetteError("Unknown cassette mode '{}', expected one of {}".format(mode, self.MODES))
+        self.path = path
+        self.mode = mode
+        self.strict = strict
+        self.played = 0
+        self.missed = 0
+        self.recorded = 0
+        self._interactions = defaultdict(deque)
+        self._recording_path = path + '.recording'
+        self._file = None
+        self._saved = False
+        self._lock = threading.Lock()
+        if mode == 'replay':
+            self.load()
+        elif os.path.exists(self._recording_path):
+            os.remove(self._recording_path)
+
+    @staticmethod
+    def _key(request: requests.PreparedRequest) -> Tuple[str, str, str]:
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode()
+        return request.method, request.url, hashlib.sha1(body).hexdigest() if body else ''
+
+    def load(self):
+        """
+        Read all interactions from cassette file into memory
+
+        :return: None
+        :raises CassetteError: If cassette file doesn't exist
+        """
+        if not os.path.exists(self.path):
+            raise CassetteError("Cassette '{}' doesn't exist, run in record mode first".format(self.path))
+        with gzip.open(self.path, 'rt', encoding='utf-8') as cassette_file:
+            for line in cassette_file:
+                interaction = json.loads(line)
+                key = interaction['method'], interaction['url'], interaction['body_hash']
+                self._interactions[key].append(interaction)
+        log.info("GITHUB: {} interactions were loaded from cassette '{}'".format(
+            sum(len(queue) for queue in self._interactions.values()), self.path))
+
+    def _open(self):
+        """
+        Open temporary file interactions are written to. Cassette saved before is reopened for appending
+        """
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if self._saved and os.path.exists(self.path):
+                os.replace(self.path, self._recording_path)
+            self._file = gzip.open(self._recording_path, 'at', encoding='utf-8')
+        return self._file
+
+    def save(self):
+        """
+        Finish recorded interactions and move them to cassette file
+
+        :return: None
+        """
+        if self.mode != 'record':
+            return
+        with self._lock:
+            self._open().close()
+            self._file = None
+            os.replace(self._recording_path, self.path)
+            self._saved = True
+        log.info("GITHUB: {} interactions were saved to cassette '{}'".format(self.recorded, self.path))
+
+    @staticmethod
+    def merge(path: str, parts: List[str]):
+        """
+        Join cassettes recorded by parallel workers into one cassette
+
+        :param path: Path to merged cassette
+        :param parts: Paths to recorded cassettes, missing ones are skipped. Merged parts are deleted
+        :return: None
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as cassette_file:
+            for part in parts:
+                if not os.path.exists(part):
+                    continue
+                with gzip.open(part, 'rt', encoding='utf-8') as part_file:
+                    shutil.copyfileobj(part_file, cassette_file)
+                os.remove(part)
+        log.info("GITHUB: Cassettes {} were merged to '{}'".format(parts, path))
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        """
+        Capture interaction. Body of response that was not read yet is captured when the caller reads it
+        to the end, e.g. by response.content or by iterating response with stream=True
+
+        :param request: Sent request
+        :param response: Server response
+        :return: None
+        """
+        method, url, body_hash = self._key(request)
+        interaction = {'method': method, 'url': url, 'body_hash': body_hash, 'status': response.status_code,
+                       'reason': response.reason, 'headers': dict(response.headers)}
+        if response._content_consumed or response.raw is None:
+            self._add(interaction, io.BytesIO(response.content or b''))
+        else:
+            response.raw = _TeeRaw(response.raw, lambda body_file: self._add(interaction, body_file))
+
+    def _add(self, interaction: Dict, body_file: BinaryIO):
+        size = body_file.tell()
+        body_file.seek(0)
+        if size <= _SPOOL_SIZE:
+            body = body_file.read()
+            try:
+                interaction['body'] = body.decode('utf-8')
+            except UnicodeDecodeError:
+                interaction['body_b64'] = base64.b64encode(body).decode('ascii')
+            line = json.dumps(interaction, separators=(',', ':')) + '\n'
+            with self._lock:
+                self._open().write(line)
+                self.recorded += 1
+            return
+
+        # Large body is encoded chunk by chunk straight into the cassette line
+        head = json.dumps(interaction, separators=(',', ':'))[:-1] + ',"body_b64":"'
+        with self._lock:
+            cassette_file = self._open()
+            cassette_file.write(head)
+            for chunk in iter(lambda: body_file.read(_BASE64_CHUNK), b''):
+                cassette_file.write(base64.b64encode(chunk).decode('ascii'))
+            cassette_file.write('"}\n')
+            self.recorded += 1
+
+    def play(self, request: requests.PreparedRequest) -> requests.Response:
+        """
+        Return recorded response for request
+
+        :param request: Request to answer
+        :return: Recorded response or None if there is no such request in cassette
+        """
+        with self._lock:
+            queue = self._interactions.get(self._key(request))
+            if not queue:
+                self.missed += 1
+                return None
+            # The last recorded answer is repeated when request is sent more times than during recording
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            self.played += 1
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        for header in ('Content-Encoding', 'Transfer-Encoding'):
+            response.headers.pop(header, None)
+        response._content = interaction['body'].encode('utf-8') if 'body' in interaction \
+            else base64.b64decode(interaction['body_b64'])
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter recording or replaying interactions of wrapped adapter
+    """
+
+    def __init__(self, cassette: Cassette, transport: HTTPAdapter):
+        """
+        :param cassette: Cassette to record to or replay from
+        :param transport: Adapter sending real requests
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.transport = transport
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """
+        Send request or answer it from cassette
+
+        :param request: Prepared request
+        :param kwargs: Arguments of ``requests.adapters.HTTPAdapter.send``
+        :return: Response
+        :raises CassetteError: If request was not recorded and cassette is strict
+        """
+        if self.cassette.mode == 'replay':
+            response = self.cassette.play(request)
+            if response is not None:
+                return response
+            if self.cassette.strict:
+                raise CassetteError("Request {} {} was not recorded in cassette '{}'".format(
+                    request.method, request.url, self.cassette.path))
+            return self.transport.send(request, **kwargs)
+
+        response = self.transport.send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,173 @@
+"""Rate limit aware scheduling of GITHUB requests"""
+
+import email.utils
+import logging as log
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Seconds to wait after rate limited response which doesn't tell how long to wait
+DEFAULT_WAIT = 60.0
+
+
+class RateLimiter:
+    """
+    Tracks budget from X-RateLimit-* headers of every response and spreads remaining requests
+    until the reset time, so parallel suites do not run out of quota halfway through.
+    Secondary rate limit responses (403/429 with Retry-After) are waited out and resent
+
+    :Example:
+
+    .. code-block:: python
+
+        from github_sdk import GITHUB, RateLimiter
+
+        github_api = GITHUB("api.github.com", token, rate_limiter=RateLimiter())
+        github_api.user.get_user()
+        print(github_api.rate_limiter.stats)
+        {'limit': 5000, 'remaining': 4999, 'reset': 1651775275, 'requests': 1, 'throttled': 0, ...}
+    """
+
+    def __init__(self, pace_below: float = 0.5, reserve: int = 0, max_secondary_retries: int = 3,
+                 max_wait: float = 3600):
+        """
+        :param pace_below: Requests are paced once remaining part of quota drops below this fraction of limit.
+            Before that they are sent without delay
+        :param reserve: Number of requests kept untouched until reset, e.g. for teardown
+        :param max_secondary_retries: How many times request is resent after secondary rate limit response
+        :param max_wait: Max seconds to wait before one request
+        """
+        self.pace_below = pace_below
+        self.reserve = reserve
+        self.max_secondary_retries = max_secondary_retries
+        self.max_wait = max_wait
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.requests = 0
+        self.throttled = 0
+        self.throttle_wait = 0.0
+        self.secondary_limits = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        """
+        Reserve slot for next request and return how long to wait for it
+
+        :return: Seconds to wait
+        """
+        with self._lock:
+            self.requests += 1
+            now = time.time()
+            if self.remaining is None or self.reset is None or now >= self.reset:
+                return 0.0
+            window = self.reset - now
+            budget = self.remaining - self.reserve
+            if budget <= 0:
+                delay = window
+            elif self.limit and self.remaining >= self.limit * self.pace_below:
+                delay = 0.0
+            else:
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + window / budget
+                delay = slot - now
+            self.remaining = max(self.remaining - 1, 0)
+            return min(delay, self.max_wait)
+
+    def _wait(self, seconds: float):
+        if seconds <= 0:
+            return
+        log.debug("GITHUB: Rate limit, waiting {:.2f} seconds".format(seconds))
+        with self._lock:
+            self.throttled += 1
+            self.throttle_wait += seconds
+        time.sleep(seconds)
+
+    def update(self, response: requests.Response):
+        """
+        Update budget from response headers
+
+        :param response: Server response
+        :return: None
+        """
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        try:
+            limit = int(headers.get('X-RateLimit-Limit', 0)) or None
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = int(headers.get('X-RateLimit-Reset', 0)) or None
+        except ValueError:
+            return
+        with self._lock:
+            # Responses of parallel requests may come out of order, keep the lowest value within one window
+            if reset != self.reset or self.remaining is None or remaining < self.remaining:
+                self.remaining = remaining
+            self.limit = limit
+            self.reset = reset
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Return delay requested by secondary rate limit response
+
+        :param response: Server response
+        :return: Seconds to wait or None if response is not rate limited
+        """
+        if response.status_code not in (403, 429):
+            return None
+        value = response.headers.get('Retry-After')
+        if value is not None:
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                pass
+            try:
+                return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                log.warning("GITHUB: Retry-After header '{}' is not valid, waiting {} seconds".format(
+                    value, DEFAULT_WAIT))
+                return DEFAULT_WAIT
+        if response.headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in response.headers:
+            return max(int(response.headers['X-RateLimit-Reset']) - time.time(), 0.0)
+        return DEFAULT_WAIT if response.status_code == 429 else None
+
+    def send(self, send: Callable[..., requests.Response], request: requests.PreparedRequest, **kwargs) \
+            -> requests.Response:
+        """
+        Wait for request slot, send request and update budget. Rate limited requests are resent after delay
+
+        :param send: Function sending prepared request
+        :param request: Prepared request
+        :param kwargs: Arguments of ``requests.Session.send``
+        :return: Server response
+        """
+        for attempt in range(self.max_secondary_retries + 1):
+            self._wait(self._delay())
+            response = send(request, **kwargs)
+            self.update(response)
+            delay = self.retry_after(response)
+            if delay is None or attempt == self.max_secondary_retries or delay > self.max_wait:
+                return response
+            with self._lock:
+                self.secondary_limits += 1
+            log.warning("GITHUB: Rate limited with status code {}, resending '{}' in {:.2f} seconds".format(
+                response.status_code, request.url, delay))
+            response.close()
+            self._wait(delay)
+        return response
+
+    @property
+    def stats(self) -> Dict:
+        """
+        Return current budget and throttling counters
+
+        :return: Dictionary with limit, remaining requests, reset time, number of requests,
+            number of throttled waits, total throttle wait in seconds and number of secondary rate limit responses
+        """
+        return {'limit': self.limit, 'remaining': self.remaining, 'reset': self.reset, 'requests': self.requests,
+                'throttled': self.throttled, 'throttle_wait': round(self.throttle_wait, 3),
+                'secondary_limits': self.secondary_limits}
@@ -0,0 +1,120 @@
+"""GraphQL resource"""
+
+import json
+import logging as log
+from typing import Dict, Tuple
+
+from requests import Session
+
+from github_sdk.resources.resource import Resource
+from ..responses.graphql_response import GraphQLResponse
+from ..responses.response import Response
+
+USER_FIELDS = "login id name email"
+ISSUE_FIELDS = "id number title state url author { login } assignees(first: 10) { nodes { login } } " \
+               "labels(first: 10) { nodes { name } }"
+BRANCH_FIELDS = "name target { oid ... on Commit { author { user { login } } } }"
+
+
+class GraphQL(Resource):
+    """
+    Class for GraphQL resource. Collapses several lookups into one aliased query,
+    so they cost one round trip and one request of rate limit
+
+    :Example:
+
+    .. code-block:: python
+
+        github_api = GITHUB("api.github.com", token)
+        results = github_api.graphql.batch({
+            "me": GraphQL.viewer(),
+            "issue": GraphQL.issue("octocat", "hello-world", 1),
+            "branch": GraphQL.branch("octocat", "hello-world", "demo")})
+        print(results["me"].json["login"], results["issue"].json["state"], results["branch"].ok)
+    """
+
+    def __init__(self, hostname: str, token: str, rest_client: Session):
+        super().__init__(hostname, rest_client, token)
+        # GitHub Enterprise serves REST API from /api/v3 and GraphQL API from /api/graphql
+        self.url = f"{hostname[:-len('/v3')]}/graphql" if hostname.endswith("/api/v3") else f"{hostname}/graphql"
+
+    @staticmethod
+    def viewer(fields: str = USER_FIELDS) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Lookup of user owning the token
+        :param fields: Fields of User object to return
+        :return: Lookup to pass to batch
+        """
+        return f"viewer {{ {fields} }}", ()
+
+    @staticmethod
+    def user(login: str, fields: str = USER_FIELDS) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Lookup of user by login
+        :param login: The user's login
+        :param fields: Fields of User object to return
+        :return: Lookup to pass to batch
+        """
+        return f"user(login: {json.dumps(login)}) {{ {fields} }}", ()
+
+    @staticmethod
+    def issue(owner: str, repo: str, number: int, fields: str = ISSUE_FIELDS) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Lookup of repository issue
+        :param owner: The account owner of the repository
+        :param repo: The name of the repository
+        :param number: The number of the issue
+        :param fields: Fields of Issue object to return
+        :return: Lookup to pass to batch
+        """
+        return f"repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) " \
+               f"{{ issue(number: {int(number)}) {{ {fields} }} }}", ("issue",)
+
+    @staticmethod
+    def branch(owner: str, repo: str, branch: str, fields: str = BRANCH_FIELDS) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Lookup of repository branch
+        :param owner: The account owner of the repository
+        :param repo: The name of the repository
+        :param branch: The name of the branch
+        :param fields: Fields of Ref object to return
+        :return: Lookup to pass to batch
+        """
+        return f"repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) " \
+               f"{{ ref(qualifiedName: {json.dumps('refs/heads/' + branch)}) {{ {fields} }} }}", ("ref",)
+
+    def query(self, query: str, variables: Dict = None) -> Response:
+        """
+        Send GraphQL query
+        :param query: GraphQL query
+        :param variables: Query variables
+        :return: Response object
+        """
+        json_body = {'query': query, 'variables': variables or {}}
+        resp = self._rest_client.post(self.url, json=json_body, headers=self.headers)
+        return Response(resp)
+
+    def batch(self, lookups: Dict[str, Tuple[str, Tuple[str, ...]]]) -> Dict[str, GraphQLResponse]:
+        """
+        Send several lookups as one aliased GraphQL query
+        :param lookups: Dictionary with aliases and lookups built by viewer, user, issue or branch methods.
+            Alias must be valid GraphQL name
+        :return: Dictionary with aliases and responses of each lookup
+        """
+        query = "query { " + " ".join(f"{alias}: {lookup}" for alias, (lookup, _) in lookups.items()) + " }"
+        response = self.query(query)
+
+        body = response.json if response.content else {}
+        data = body.get('data') or {}
+        errors = body.get('errors') or []
+        if errors:
+            log.warning("GITHUB: GraphQL batch returned errors: {}".format(errors))
+
+        results = dict()
+        for alias, (_, path) in lookups.items():
+            value = data.get(alias)
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            alias_errors = [error for error in errors if (error.get('path') or [None])[0] == alias]
+            results[alias] = GraphQLResponse(response.response, alias, value, alias_errors)
+        return results
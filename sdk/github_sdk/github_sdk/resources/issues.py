@@ -1,8 +1,15 @@
 """Issues resource"""
 
+import itertools
+import logging as log
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, Iterator
+
 from requests import Session
 
-from github_sdk.resources.resource import Resource
+from github_sdk.resources.resource import Resource, AsyncResource
+from ..retry import IDEMPOTENT_HEADER
+from ..async_session import AsyncSession
 from ..responses.response import Response
 
 
@@ -15,7 +22,8 @@ class Issues(Resource):
         super().__init__(hostname, rest_client, token)
         self.base = f"{hostname}/repos"
 
-    def create_issues(self, owner: str, repo: str, title: str, body: str, assignees: str, labels: str) -> Response:
+    def create_issues(self, owner: str, repo: str, title: str, body: str, assignees: str, labels: str,
+                      idempotent: bool = False) -> Response:
         """
         Rename the branch from Github
         :param owner: The account owner of the repository. The name is not case sensitive.
@@ -24,10 +32,120 @@ class Issues(Resource):
         :param body: The contents of the issue.
         :param assignees: Logins for Users to assign to this issue.
         :param labels: Labels to associate with this issue.
+        :param idempotent: If True, request is resent by retry policy on transient failures,
+            so the issue may be created twice.
         :return: Response object
         """
         api_url = f'{self.base}/{owner}/{repo}/issues'
         json_body = {'title': title, 'body': body,
                      'assignees': [assignees], 'labels': [labels]}
-        resp = self._rest_client.post(api_url, json=json_body, headers=self.headers)
+        headers = dict(self.headers, **{IDEMPOTENT_HEADER: 'true'}) if idempotent else self.headers
+        resp = self._rest_client.post(api_url, json=json_body, headers=headers)
+        return Response(resp)
+
+    def close_issue(self, owner: str, repo: str, number: int) -> Response:
+        """
+        Close the issue
+        :param owner: The account owner of the repository. The name is not case sensitive.
+        :param repo: The name of the repository. The name is not case sensitive.
+        :param number: The number that identifies the issue.
+        :return: Response object
+        """
+        api_url = f'{self.base}/{owner}/{repo}/issues/{number}'
+        # Closing closed issue changes nothing, so request is always safe to resend
+        resp = self._rest_client.patch(api_url, json={'state': 'closed'},
+                                       headers=dict(self.headers, **{IDEMPOTENT_HEADER: 'true'}))
+        return Response(resp)
+
+    def list_issues(self, owner: str, repo: str, state: str = 'open', per_page: int = 100, page: int = 1,
+                    stream: bool = False) -> Response:
+        """
+        Get one page of repository issues
+        :param owner: The account owner of the repository. The name is not case sensitive.
+        :param repo: The name of the repository. The name is not case sensitive.
+        :param state: Indicates the state of the issues to return: open, closed or all.
+        :param per_page: The number of results per page (max 100).
+        :param page: Page number of the results to fetch.
+        :param stream: If True, body is not downloaded in advance, use Response.iter_json_array to read issues
+        :return: Response object
+        """
+        api_url = f'{self.base}/{owner}/{repo}/issues'
+        params = {'state': state, 'per_page': per_page, 'page': page}
+        resp = self._rest_client.get(api_url, params=params, headers=self.headers, stream=stream)
         return Response(resp)
+
+    def iter_issues(self, owner: str, repo: str, state: str = 'open', per_page: int = 100) -> Iterator[Dict]:
+        """
+        Iterate over all issues of the repository without loading them into memory at once
+        :param owner: The account owner of the repository. The name is not case sensitive.
+        :param repo: The name of the repository. The name is not case sensitive.
+        :param state: Indicates the state of the issues to return: open, closed or all.
+        :param per_page: The number of results per page (max 100).
+        :return: Generator of issues dictionaries
+        """
+        api_url = f'{self.base}/{owner}/{repo}/issues'
+        return self._paginate(api_url, params={'state': state, 'per_page': per_page})
+
+    def create_issues_bulk(self, owner: str, repo: str, issues: Iterable[Dict], concurrency: int = 8,
+                           on_error: Callable[[Dict, Exception], None] = None,
+                           idempotent: bool = False) -> Iterator[Response]:
+        """
+        Create many issues concurrently. Issue specs are read lazily, so no more than ``concurrency`` of them
+        are held in memory at once
+        :param owner: The account owner of the repository. The name is not case sensitive.
+        :param repo: The name of the repository. The name is not case sensitive.
+        :param issues: Iterable or generator of dictionaries with ``create_issues`` arguments
+            (title, body, assignees, labels)
+        :param concurrency: Number of issues created in parallel. Keep it within pool_maxsize of SESSION_POOL,
+            requests above it wait for free connection
+        :param on_error: Called with issue spec and exception for every issue that could not be sent.
+            Failed issues are logged and skipped, the rest of the batch continues
+        :param idempotent: If True, requests are resent by retry policy on transient failures,
+            so some issues may be created twice
+        :return: Generator of Response objects in order of completion
+        """
+        specs = iter(issues)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = {executor.submit(self.create_issues, owner, repo, idempotent=idempotent, **spec): spec
+                       for spec in itertools.islice(specs, concurrency)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = pending.pop(future)
+                    try:
+                        resp = future.result()
+                    except Exception as msg:
+                        log.error("GITHUB: Could not create issue '{}': {}".format(spec.get('title'), msg))
+                        if on_error is not None:
+                            on_error(spec, msg)
+                        continue
+                    yield resp
+                for spec in itertools.islice(specs, len(done)):
+                    pending[executor.submit(self.create_issues, owner, repo, idempotent=idempotent, **spec)] = spec
+
+
+class AsyncIssues(AsyncResource):
+    """Class for issues resource with asyncio methods"""
+
+    def __init__(self, hostname: str,
+                 token: str,
+                 rest_client: AsyncSession):
+        super().__init__(hostname, rest_client, token)
+        self.base = f"{hostname}/repos"
+
+    async def create_issues(self, owner: str, repo: str, title: str, body: str, assignees: str,
+                            labels: str) -> Response:
+        """
+        Create an issue in Github
+        :param owner: The account owner of the repository. The name is not case sensitive.
+        :param repo: The name of the repository. The name is not case sensitive.
+        :param title: The title of the issue.
+        :param body: The contents of the issue.
+        :param assignees: Logins for Users to assign to this issue.
+        :param labels: Labels to associate with this issue.
+        :return: Response object
+        """
+        api_url = f'{self.base}/{owner}/{repo}/issues'
+        json_body = {'title': title, 'body': body,
+                     'assignees': [assignees], 'labels': [labels]}
+        return await self._request("POST", api_url, json=json_body)
@@ -2,22 +2,197 @@
 Module for base GITHUB response
 """
 
+import codecs
+import gzip
+import itertools
+import json
 import logging as log
-from typing import Dict
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import requests
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_UNSET = object()
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+_LITERAL = re.compile(rb'[^,\]} \t\n\r]+')
+_TEXT_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_PAYLOAD_LOGGING = {'max_bytes': 4096, 'sidecar_path': None}
+_SIDECAR_NUMBERS = itertools.count(1)
+# Objects and arrays above this size are skipped by get_field slower than the whole body is decoded
+_MAX_SKIP = 64 * 1024
+
+
+def set_json_backend(loads: Callable[[bytes], Any]):
+    """
+    Set function used to decode response bodies. By default orjson is used if installed, json otherwise
+
+    :param loads: Function which accepts bytes and returns decoded object, e.g. ujson.loads
+    :return: None
+    """
+    global _json_loads
+    _json_loads = loads
+
+
+def set_payload_logging(max_bytes: int = 4096, sidecar_path: Optional[str] = None):
+    """
+    Set defaults of Response.log_payload
+
+    :param max_bytes: Bodies above this size are truncated in log, 0 means no limit
+    :param sidecar_path: Folder to write full truncated bodies to as gzip files, None means not to write them
+    :return: None
+    """
+    _PAYLOAD_LOGGING['max_bytes'] = max_bytes
+    _PAYLOAD_LOGGING['sidecar_path'] = sidecar_path
+
+
+class _Payload:
+    """
+    Log message argument which formats response body only when log record is formatted by handler
+    """
+
+    __slots__ = ('response', 'max_bytes', 'sidecar_path', '_text')
+
+    def __init__(self, response: "Response", max_bytes: int, sidecar_path: Optional[str]):
+        self.response = response
+        self.max_bytes = max_bytes
+        self.sidecar_path = sidecar_path
+        self._text = None
+
+    def __str__(self) -> str:
+        # Every handler formats record again, so body is formatted once and reused
+        if self._text is None:
+            self._text = self._format()
+        return self._text
+
+    def _format(self) -> str:
+        # Runs inside logging handler, so nothing here may log: with queue logging the listener thread
+        # would wait for free space in its own queue. Body is decoded directly instead of Response.json,
+        # which logs decoding errors
+        body = self.response.response.content
+        if not self.max_bytes or len(body) <= self.max_bytes:
+            try:
+                return json.dumps(_json_loads(body), indent=4, sort_keys=True)
+            except Exception:
+                return body.decode(errors='replace')
+
+        text = "{}... <{} of {} bytes>".format(body[:self.max_bytes].decode(errors='replace'), self.max_bytes,
+                                               len(body))
+        if self.sidecar_path:
+            sidecar_file = os.path.join(self.sidecar_path, "payload_{}_{}.json.gz".format(os.getpid(),
+                                                                                        next(_SIDECAR_NUMBERS)))
+            try:
+                os.makedirs(self.sidecar_path, exist_ok=True)
+                with gzip.open(sidecar_file, 'wb') as payload_file:
+                    payload_file.write(body)
+                text += " full body: '{}'".format(sidecar_file)
+            except OSError as msg:
+                text += " full body was not written to '{}': {}".format(sidecar_file, msg)
+        return text
+
+
+def _skip_ws(data: bytes, pos: int) -> int:
+    return _WHITESPACE.match(data, pos).end()
+
+
+def _value_end(data: bytes, pos: int, limit: int = None) -> int:
+    """
+    Find end of JSON value without decoding it
+
+    :param data: JSON document
+    :param pos: Start of the value
+    :param limit: Max number of bytes of object or array to scan, None means no limit
+    :return: Position after the value or -1 if object or array is longer than limit
+    """
+    first = data[pos:pos + 1]
+    if first == b'"':
+        return _STRING.match(data, pos).end()
+    if first not in (b'{', b'['):
+        return _LITERAL.match(data, pos).end()
+    stop = pos + limit if limit is not None else None
+    depth = 0
+    while True:
+        match = _STRUCTURE.search(data, pos)
+        pos = match.end()
+        if stop is not None and pos > stop:
+            return -1
+        token = data[match.start():match.start() + 1]
+        if token == b'"':
+            continue
+        depth += 1 if token in (b'{', b'[') else -1
+        if depth == 0:
+            return pos
+
+
+def _find_member(data: bytes, pos: int, key: str) -> Tuple[int, int]:
+    """
+    Find value of object member without decoding other members
+
+    :param data: JSON document
+    :param pos: Start of the object
+    :param key: Member name
+    :return: Start and end of the value, (-1, -1) if member doesn't exist or (-2, -2) if member is placed
+        after object or array longer than _MAX_SKIP bytes, which is faster to decode than to scan
+    """
+    pos = _skip_ws(data, pos)
+    if data[pos:pos + 1] != b'{':
+        return -1, -1
+    pos = _skip_ws(data, pos + 1)
+    while data[pos:pos + 1] == b'"':
+        key_end = _STRING.match(data, pos).end()
+        name = json.loads(data[pos:key_end])
+        pos = _skip_ws(data, key_end)
+        pos = _skip_ws(data, pos + 1)
+        if name == key:
+            return pos, _value_end(data, pos)
+        end = _value_end(data, pos, _MAX_SKIP)
+        if end < 0:
+            return -2, -2
+        pos = _skip_ws(data, end)
+        if data[pos:pos + 1] != b',':
+            break
+        pos = _skip_ws(data, pos + 1)
+    return -1, -1
+
+
+def _field(value, keys: Tuple[str, ...], default):
+    """
+    Return nested field of decoded json
+
+    :param value: Decoded json
+    :param keys: Path to the field
+    :param default: Value returned if field doesn't exist
+    :return: Field value
+    """
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
 
 class Response:
     """
     Class for Base GITHUB response
     """
 
+    __slots__ = ('response', '_content', '_json')
+
     def __init__(self, response: requests.Response):
         """
         :param response: Object, which contains a server's response to HTTP request
         """
         self.response = response
+        self._content = None
+        self._json = _UNSET
 
     @property
     def status_code(self):
@@ -58,6 +233,31 @@ class Response:
             log.error("GITHUB: Exception occurred: {}".format(msg))
             raise
 
+    @property
+    def from_cache(self) -> bool:
+        """
+        Return True if body was taken from response cache after server answered 304 Not Modified
+
+        :return: True if response is cached
+        """
+        return getattr(self.response, 'from_cache', False)
+
+    @property
+    def links(self) -> Dict[str, str]:
+        """
+        Return URLs from Link header by their relation type, e.g. {'next': 'https://...', 'last': 'https://...'}
+
+        :return: Dictionary with relation types and URLs
+        """
+        links = dict()
+        for link in self.headers.get('Link', '').split(','):
+            url, _, params = link.partition(';')
+            for param in params.split(';'):
+                key, _, value = param.strip().partition('=')
+                if key == 'rel':
+                    links[value.strip('"')] = url.strip(' <>')
+        return links
+
     @property
     def content(self) -> str:
         """
@@ -66,7 +266,9 @@ class Response:
         :return: Content of the response
         """
         try:
-            return self.response.content.decode()
+            if self._content is None:
+                self._content = self.response.content.decode()
+            return self._content
         except Exception as msg:
             log.error("GITHUB: Exception occurred: {}".format(msg))
             raise
@@ -74,16 +276,79 @@ class Response:
     @property
     def json(self) -> Dict:
         """
-        Return json from the response
+        Return json from the response. Body is decoded once and the result is reused
 
         :return: Content of the response
         """
         try:
-            return self.response.json()
+            if self._json is _UNSET:
+                self._json = _json_loads(self.response.content)
+            return self._json
         except Exception as msg:
             log.error("GITHUB: Exception occurred: {}".format(msg))
             raise
 
+    def get_field(self, *keys: str, default=None):
+        """
+        Return one field of json object. If json was not decoded yet, only the field itself is decoded,
+        the rest of the body is skipped. If the field is placed after large object or array, the whole body
+        is decoded instead, as skipping is slower than decoding
+
+        :param keys: Name of the field or path to nested field
+        :param default: Value returned if field doesn't exist
+        :return: Field value
+
+        :Example:
+
+        .. code-block:: python
+
+            response = github_api.branch.rename_branch(owner, repo, "demo", "demo_edit")
+            print(response.get_field("commit", "author", "login"))
+        """
+        try:
+            if self._json is not _UNSET:
+                return _field(self._json, keys, default)
+
+            data = self.response.content
+            start, end = 0, len(data)
+            for key in keys:
+                start, end = _find_member(data, start, key)
+                if start == -2:
+                    return _field(self.json, keys, default)
+                if start < 0:
+                    return default
+            return _json_loads(data[start:end])
+        except Exception as msg:
+            log.error("GITHUB: Exception occurred: {}".format(msg))
+            raise
+
+    def log_payload(self, level: int = log.INFO, max_bytes: int = None, sidecar_path: Optional[str] = _UNSET):
+        """
+        Log body as indented json. Body is formatted only if log record is written and only once,
+        bodies above size limit are truncated and optionally written in full to gzip file
+
+        :param level: Logging level
+        :param max_bytes: Bodies above this size are truncated, 0 means no limit. By default limit from
+            set_payload_logging is used
+        :param sidecar_path: Folder to write full truncated body to, None means not to write it. By default folder
+            from set_payload_logging is used
+        :return: None
+
+        :Example:
+
+        .. code-block:: python
+
+            response = github_api.issues.create_issues(owner, repo, title="Issue")
+            response.log_payload()
+        """
+        logger = log.getLogger()
+        if not logger.isEnabledFor(level):
+            return
+        payload = _Payload(self,
+                           _PAYLOAD_LOGGING['max_bytes'] if max_bytes is None else max_bytes,
+                           _PAYLOAD_LOGGING['sidecar_path'] if sidecar_path is _UNSET else sidecar_path)
+        logger.log(level, "%s", payload, stacklevel=2)
+
     @property
     def url(self) -> str:
         """
@@ -96,3 +361,82 @@ class Response:
         except Exception as msg:
             log.error("GITHUB: Exception occurred: {}".format(msg))
             raise
+
+    def iter_bytes(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Iterate over body in chunks. For responses received with stream=True the body is never loaded
+        into memory at once
+
+        :param chunk_size: Size of chunk in bytes
+        :return: Generator of body chunks
+        """
+        try:
+            yield from self.response.iter_content(chunk_size=chunk_size)
+        except Exception as msg:
+            log.error("GITHUB: Exception occurred: {}".format(msg))
+            raise
+
+    def save_to(self, path: str, chunk_size: int = 1024 * 1024) -> int:
+        """
+        Write body to file chunk by chunk
+
+        :param path: Path to file
+        :param chunk_size: Size of chunk in bytes
+        :return: Number of written bytes
+        """
+        written = 0
+        with open(path, 'wb') as body_file:
+            for chunk in self.iter_bytes(chunk_size):
+                body_file.write(chunk)
+                written += len(chunk)
+        log.debug("GITHUB: {} bytes from '{}' were saved to '{}'".format(written, self.url, path))
+        return written
+
+    def iter_json_array(self, chunk_size: int = 64 * 1024) -> Iterator:
+        """
+        Decode top level json array item by item while body is downloaded,
+        only one item and one chunk are held in memory at once
+
+        :param chunk_size: Size of chunk in bytes
+        :return: Generator of array items
+        :raises ValueError: If body is not json array
+        """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder(self.response.encoding or 'utf-8')()
+        chunks = self.iter_bytes(chunk_size)
+        buffer, pos, started, finished = '', 0, False, False
+        while True:
+            pos = _TEXT_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                if not started:
+                    if buffer[pos] != '[':
+                        raise ValueError("GITHUB: Response body is not json array")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == ']':
+                    return
+                if buffer[pos] == ',':
+                    pos += 1
+                    continue
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    # Number at the end of buffer may be not complete yet, so item is taken only if it is followed
+                    # by delimiter
+                    if finished or buffer[end:end + 1] in (',', ']', ' ', '\t', '\n', '\r'):
+                        yield item
+                        # Decoded items are dropped from buffer once per chunk, not after every item
+                        pos = end
+                        continue
+                except ValueError:
+                    if finished:
+                        raise
+            if finished:
+                raise ValueError("GITHUB: Response body ended before json array was closed")
+            chunk = next(chunks, None)
+            if chunk is None:
+                buffer += text_decoder.decode(b'', final=True)
+                finished = True
+            else:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+                pos = 0
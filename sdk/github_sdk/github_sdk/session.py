@@ -0,0 +1,137 @@
+"""Session shared by all resources of one GITHUB object"""
+
+import functools
+import logging as log
+import time
+from typing import Callable, Dict
+
+import requests
+
+from .adapters import PoolAdapter, connection_timings
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import IDEMPOTENT_HEADER, RetryPolicy
+
+HOOK_EVENTS = ('before_request', 'after_response')
+
+
+def _endpoint(request: requests.PreparedRequest) -> str:
+    """
+    Return request method and URL path with owner, repository, branch and numbers replaced by placeholders,
+    e.g. "POST /repos/{owner}/{repo}/branches/{branch}/rename"
+    """
+    parts = requests.utils.urlparse(request.url).path.strip('/').split('/')
+    if parts[0] == 'repos' and len(parts) >= 3:
+        parts[1:3] = ['{owner}', '{repo}']
+        for index in range(3, len(parts) - 1):
+            if parts[index] in ('branches', 'tarball', 'zipball'):
+                parts[index + 1] = '{branch}'
+    parts = ['{number}' if part.isdigit() else part for part in parts]
+    return "{} /{}".format(request.method, '/'.join(parts))
+
+
+def _body_size(body) -> int:
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return 0
+
+
+class GithubSession(requests.Session):
+    """
+    ``requests.Session`` which passes every request through optional GITHUB specific layers
+    """
+
+    def __init__(self, cache: ResponseCache = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None):
+        """
+        :param cache: Conditional request cache. If None, responses are not cached
+        :param rate_limiter: Rate limit aware scheduler. If None, requests are not paced
+        :param retry_policy: Policy for resending failed requests. If None, requests are not retried
+        """
+        super().__init__()
+        self.mount('https://', PoolAdapter())
+        self.mount('http://', PoolAdapter())
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.request_hooks = {event: [] for event in HOOK_EVENTS}
+
+    def add_hook(self, event: str, callback: Callable):
+        """
+        Register callback called for every request sent over the network, including each retry
+
+        :param event: before_request - callback is called with prepared request before it is sent,
+            after_response - callback is called with prepared request, response (None if request failed)
+            and dictionary with timings in seconds and sizes in bytes:
+            method, url, endpoint, status_code, start, dns, connect (TCP, dns and connect are 0 for reused
+            connection), tls, ttfb (time to response headers), server (ttfb without dns, connect and tls),
+            download, total, request_bytes, response_bytes, error.
+            Redirects are reported as separate requests.
+            Exception raised by after_response callback is logged and doesn't fail the request
+        :param callback: Function to call
+        :return: None
+        :raises KeyError: If event is unknown
+        """
+        if event not in self.request_hooks:
+            raise KeyError("Unknown hook event '{}', expected one of {}".format(event, HOOK_EVENTS))
+        self.request_hooks[event].append(callback)
+
+    def _send_with_hooks(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        for callback in self.request_hooks['before_request']:
+            callback(request)
+
+        response, error = None, None
+        start_time = time.time()
+        start = time.perf_counter()
+        with connection_timings() as connection:
+            try:
+                response = super().send(request, **kwargs)
+                return response
+            except Exception as msg:
+                error = msg
+                raise
+            finally:
+                self._after_response(request, response, error, start_time, time.perf_counter() - start, connection)
+
+    def _after_response(self, request: requests.PreparedRequest, response: requests.Response, error: Exception,
+                        start_time: float, total: float, connection: Dict[str, float]):
+        ttfb = response.elapsed.total_seconds() if response is not None else total
+        response_bytes = None
+        if response is not None:
+            if response._content_consumed and isinstance(response._content, bytes):
+                response_bytes = len(response._content)
+            elif response.headers.get('Content-Length', '').isdigit():
+                response_bytes = int(response.headers['Content-Length'])
+        timing = {'method': request.method, 'url': request.url, 'endpoint': _endpoint(request),
+                  'status_code': response.status_code if response is not None else None,
+                  'start': start_time, 'dns': connection['dns'], 'connect': connection['connect'],
+                  'tls': connection['tls'], 'ttfb': ttfb, 'server': max(ttfb - sum(connection.values()), 0.0),
+                  'download': max(total - ttfb, 0.0), 'total': total, 'request_bytes': _body_size(request.body),
+                  'response_bytes': response_bytes, 'error': type(error).__name__ if error is not None else None}
+        for callback in self.request_hooks['after_response']:
+            try:
+                callback(request, response, timing)
+            except Exception as msg:
+                log.error("GITHUB: Exception occurred in after_response hook {}: {}".format(callback, msg))
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """
+        Send prepared request
+
+        :param request: Prepared request
+        :param kwargs: Arguments of ``requests.Session.send``
+        :return: Server response
+        """
+        # Marker set by resource methods is read here and never sent to the server
+        idempotent = request.headers.pop(IDEMPOTENT_HEADER, None)
+        send = super().send
+        if self.request_hooks['before_request'] or self.request_hooks['after_response']:
+            send = self._send_with_hooks
+        if self.rate_limiter is not None:
+            send = functools.partial(self.rate_limiter.send, send)
+        if self.retry_policy is not None:
+            send = functools.partial(self.retry_policy.send, send,
+                                     idempotent=None if idempotent is None else idempotent.lower() == 'true')
+        if self.cache is not None:
+            send = functools.partial(self.cache.send, send)
+        return send(request, **kwargs)
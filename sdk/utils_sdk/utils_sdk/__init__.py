@@ -1,2 +1,2 @@
-from .property_manager import Properties, PropertyError, get_property, set_property
-from .utils import sleep, get_enterprise_details
+from .property_manager import Properties, PropertyError, get_property, set_property, set_properties
+from .utils import sleep, get_enterprise_details, get_enterprise_details_many
@@ -5,6 +5,12 @@ Holder for external properties
 import configparser
 import json
 import os
+import tempfile
+import threading
+from typing import Dict
+
+_CONFIG_CACHE = dict()
+_CONFIG_LOCK = threading.RLock()
 
 
 class PropertyError(Exception):
@@ -14,6 +20,55 @@ class PropertyError(Exception):
     pass
 
 
+def _read_config(config_file: str) -> configparser.ConfigParser:
+    """
+    Get parsed config file. Parsed files are cached by path and reparsed only when modification time or size
+    of the file changes. Returned parser is shared, it must not be modified
+
+    :param config_file: Path to config file
+    :return: Parsed config, empty if config file doesn't exist
+    """
+    path = os.path.abspath(config_file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _CONFIG_CACHE.pop(path, None)
+        return configparser.ConfigParser()
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        config = configparser.ConfigParser()
+        config.optionxform = str
+        config.read(path)
+        _CONFIG_CACHE[path] = (key, config)
+        return config
+
+
+def _write_config(config_file: str, config: configparser.ConfigParser):
+    """
+    Atomically replace config file: write to temporary file in the same folder and rename it over config file
+
+    :param config_file: Path to config file
+    :param config: Config to write
+    :return: None
+    """
+    path = os.path.abspath(config_file)
+    mode = os.stat(path).st_mode
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, 'w') as configfile:
+            config.write(configfile)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    stat = os.stat(path)
+    _CONFIG_CACHE[path] = ((stat.st_mtime_ns, stat.st_size), config)
+
+
 def get_property(config_file: str, property_name: str, section_name: str = None) -> str:
     """
     Get property value from config file
@@ -52,9 +107,7 @@ def get_property(config_file: str, property_name: str, section_name: str = None)
             my_value
     """
     try:
-        config = configparser.ConfigParser()
-        config.optionxform = str
-        config.read(config_file)
+        config = _read_config(config_file)
         if section_name is not None:
             return config.get(section_name, property_name)
 
@@ -105,22 +158,45 @@ def set_property(config_file: str, property_name: str, value: str, section_name:
             my_value
 
     """
+    set_properties(config_file, {property_name: value}, section_name)
+
+
+def set_properties(config_file: str, properties: Dict[str, str], section_name: str = None):
+    """
+    Set values of many properties to config file with one atomic write
+
+    :param config_file: Path to config file
+    :param properties: Dictionary with names of properties and values to be set
+    :param section_name: Name of section to which properties belong. Optional parameter.
+        If not set, method will look for every property in all sections
+    :return: None
+    :raises PropertyError: If config file doesn't exist or cannot be written
+
+    :Example:
+
+        .. code-block:: python
+
+            from utils_sdk import set_properties
+
+            set_properties("C:\\config.ini", {"my_property": "my_new_value", "other_property": "other_value"})
+    """
     if not os.path.exists(config_file):
         raise PropertyError("Property file doesn't exist")
 
-    config = configparser.ConfigParser()
-    config.optionxform = str
-    config.read(config_file)
     try:
-        if section_name is not None and property_name in config.options(section_name):
-            config.set(section_name, property_name, value)
-        else:
-            for section in config.sections():
-                if property_name in config.options(section):
-                    config.set(section, property_name, value)
-                    break
-        with open(config_file, 'w') as configfile:
-            config.write(configfile)
+        with _CONFIG_LOCK:
+            config = configparser.ConfigParser()
+            config.optionxform = str
+            config.read(config_file)
+            for property_name, value in properties.items():
+                if section_name is not None and property_name in config.options(section_name):
+                    config.set(section_name, property_name, value)
+                else:
+                    for section in config.sections():
+                        if property_name in config.options(section):
+                            config.set(section, property_name, value)
+                            break
+            _write_config(config_file, config)
     except Exception as msg:
         raise PropertyError(msg)
 
@@ -170,9 +246,7 @@ class Properties:
 
         """
 
-        config = configparser.ConfigParser()
-        config.optionxform = str
-        config.read(config_file)
+        config = _read_config(config_file)
         for section in config.sections():
             for option in config.options(section):
                 self._properties[option] = config.get(section, option)
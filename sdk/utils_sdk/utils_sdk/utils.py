@@ -4,9 +4,12 @@ Module for holding utilities
 
 import logging
 import os
-import shutil
+import tarfile
 import time
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ENTERPRISE_DETAILS_SEPARATOR = "-" * 143
 
 
 def sleep(seconds: int):
@@ -60,12 +63,29 @@ def _appl_details_str_to_dict(appl_info: str) -> Dict[str, str]:
         print(appl_dict["IP"])
         >> 10.15.0.33'
     """
-    appl_params = filter(None, appl_info.split('\n'))
+    return next(_iter_enterprise_details(appl_info.splitlines()), dict())
+
+
+def _iter_enterprise_details(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Parse enterprise details line by line and yield details of every appliance as soon as its block ends
+
+    :param lines: Lines of enterprise details, e.g. opened text file
+    :return: Generator of dictionaries with appliance details. Values may contain ':', e.g. time or IPv6 address
+    """
     appl_dict = dict()
-    for appl_param in appl_params:
-        key, value = appl_param.split(":")
-        appl_dict[key] = value.strip()
-    return appl_dict
+    for line in lines:
+        line = line.strip()
+        if line == ENTERPRISE_DETAILS_SEPARATOR:
+            if appl_dict:
+                yield appl_dict
+            appl_dict = dict()
+            continue
+        key, delimiter, value = line.partition(":")
+        if delimiter:
+            appl_dict[key] = value.strip()
+    if appl_dict:
+        yield appl_dict
 
 
 def _parse_enterprise_details(details_str: str) -> List[Dict[str, str]]:
@@ -76,13 +96,7 @@ def _parse_enterprise_details(details_str: str) -> List[Dict[str, str]]:
     :param details_str: Enterprise details as string with details for all appliances in enterprise
     :return: List of dictionaries with appliances details
     """
-    separator = "-" * 143
-
-    appl_details_list = filter(None, details_str.split(separator))
-    details = list()
-    for appl_details in appl_details_list:
-        details.append(_appl_details_str_to_dict(appl_details))
-    return details
+    return list(_iter_enterprise_details(details_str.splitlines()))
 
 
 def get_enterprise_details(archive_path: str) -> List[Dict[str, str]]:
@@ -110,17 +124,48 @@ def get_enterprise_details(archive_path: str) -> List[Dict[str, str]]:
         >>10.153.159.158
     """
     try:
-        unpack_path = archive_path.split('.')[0]
-        shutil.unpack_archive(archive_path, unpack_path)
-        logging.info("UtilsSDK: Archive from path '{}' was successfully unpacked to path '{}'".format(archive_path,
-                                                                                                      unpack_path))
-
-        enterprise_details_file = [f for f in os.listdir(unpack_path) if (f.endswith('.txt')
-                                                                          and f.startswith("enterpriseDetails"))]
-        with open("{}/{}".format(unpack_path, enterprise_details_file[0]), "r") as details_file:
-            enterprise_details = details_file.read()
-        shutil.rmtree(unpack_path, ignore_errors=True)
-        logging.info("UtilsSDK: Enterprise details were received successfully")
-        return _parse_enterprise_details(enterprise_details)
+        # Archive is read as a stream, only enterprise details file is decompressed into memory
+        with tarfile.open(archive_path, "r|*") as archive:
+            for member in archive:
+                file_name = os.path.normpath(member.name)
+                if member.isfile() and os.path.dirname(file_name) == "" \
+                        and file_name.startswith("enterpriseDetails") and file_name.endswith(".txt"):
+                    details_lines = (line.decode() for line in archive.extractfile(member))
+                    enterprise_details = list(_iter_enterprise_details(details_lines))
+                    break
+            else:
+                raise FileNotFoundError("There is no enterpriseDetails*.txt file in archive")
+        logging.info("UtilsSDK: Enterprise details were received successfully from archive '{}'".format(archive_path))
+        return enterprise_details
     except Exception as msg:
         logging.warning("UtilsSDK: Could not get enterprise details. Exception occurred. Message = {}".format(msg))
+
+
+def get_enterprise_details_many(archive_paths: Iterable[str],
+                                workers: int = None) -> List[Optional[List[Dict[str, str]]]]:
+    """
+    Get enterprise details from many tar.gz files in parallel processes
+
+    :param archive_paths: Full paths to archives with enterprise downloaded details files
+    :param workers: Number of processes, by default number of processors on the machine
+    :return: List with enterprise details of every archive in the same order as archive paths,
+        None for archive which details could not be received
+
+    :Example:
+
+    .. code-block:: python
+
+        from utils_sdk import get_enterprise_details_many
+
+        archives = ["C:\\archives\\site_1.tar.gz", "C:\\archives\\site_2.tar.gz"]
+        for archive, enterprise_details in zip(archives, get_enterprise_details_many(archives, workers=4)):
+            print(archive, len(enterprise_details))
+
+        >>C:\\archives\\site_1.tar.gz 3
+        >>C:\\archives\\site_2.tar.gz 5
+    """
+    archive_paths = list(archive_paths)
+    if not archive_paths:
+        return list()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(get_enterprise_details, archive_paths))
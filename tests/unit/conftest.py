@@ -0,0 +1,58 @@
+from typing import Callable
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from execution_utils.configurators.property_configurator import PROPERTIES
+from execution_utils.stub_server import StubServer
+from utils_sdk import Properties
+
+
+@pytest.fixture()
+def stub() -> StubServer:
+    """
+    GitHub stand-in server listening on free local port
+    """
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture()
+def properties() -> Properties:
+    """
+    Global PROPERTIES restored after the test
+    """
+    saved = dict(vars(PROPERTIES)['_properties'])
+    yield PROPERTIES
+    vars(PROPERTIES)['_properties'].clear()
+    vars(PROPERTIES)['_properties'].update(saved)
+
+
+def _make_request(url: str = "http://stub/user", method: str = "GET", body: bytes = None) -> requests.PreparedRequest:
+    return requests.Request(method, url, data=body).prepare()
+
+
+def _make_response(status_code: int = 200, headers: dict = None, body: bytes = b'{}') -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+@pytest.fixture()
+def make_request() -> Callable[..., requests.PreparedRequest]:
+    """
+    Factory of prepared requests which are never sent: make_request(url, method, body)
+    """
+    return _make_request
+
+
+@pytest.fixture()
+def make_response() -> Callable[..., requests.Response]:
+    """
+    Factory of responses with body already read: make_response(status_code, headers, body)
+    """
+    return _make_response
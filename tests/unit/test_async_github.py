@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from github_sdk import AsyncGITHUB  # noqa: E402
+from github_sdk.resources.resource import AsyncResource  # noqa: E402
+
+
+def test_requests_share_one_pool(stub):
+    async def run():
+        async with AsyncGITHUB(stub.url, "token", limit=4) as github_api:
+            users = await asyncio.gather(*[github_api.user.get_user() for _ in range(10)])
+            issues = await asyncio.gather(*[github_api.issues.create_issues("owner", "repo", "Title {}".format(number),
+                                                                            "Body", "stub-user", "bug")
+                                            for number in range(10)])
+            renamed = await github_api.branch.rename_branch("owner", "repo", "demo", "demo_edit")
+            session = github_api._rest_client._session
+        return users, issues, renamed, session
+
+    users, issues, renamed, session = asyncio.run(run())
+
+    assert {200} == {response.status_code for response in users}
+    assert "stub-user" == users[0].json['login']
+    assert list(range(1, 11)) == sorted(response.json['number'] for response in issues)
+    assert 201 == renamed.status_code
+    assert session.closed
+
+
+def test_async_resources_have_no_blocking_api(stub):
+    async def run():
+        async with AsyncGITHUB(stub.url, "token") as github_api:
+            return github_api.user, github_api.issues, github_api.branch
+
+    for resource in asyncio.run(run()):
+        assert isinstance(resource, AsyncResource)
+        assert not hasattr(resource, 'add_hook')
+        assert not hasattr(resource, '_paginate')
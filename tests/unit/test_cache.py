@@ -0,0 +1,51 @@
+from github_sdk import GITHUB, ResponseCache
+
+
+def test_not_modified_is_served_from_cache(stub):
+    """
+    Second GET is revalidated with ETag, 304 is answered with cached body
+    """
+    github_api = GITHUB(stub.url, "token", cache=ResponseCache(), shared_pool=False)
+    first = github_api.user.get_user()
+    second = github_api.user.get_user()
+
+    assert 200 == second.status_code
+    assert not first.from_cache
+    assert second.from_cache
+    assert first.json == second.json
+    assert {'entries': 1, 'hits': 1, 'misses': 1, 'evictions': 0} == github_api.cache.stats
+
+
+def test_expired_entry_is_fetched_unconditionally(make_request, make_response):
+    cache = ResponseCache(ttl=60)
+    request = make_request()
+    cache.store(request, make_response(headers={'ETag': '"v1"'}))
+    cache.get(request).stored_at -= 61
+
+    sent = []
+    cache.send(lambda request, **kwargs: sent.append(request) or make_response(headers={'ETag': '"v2"'}),
+               make_request())
+
+    assert 'If-None-Match' not in sent[0].headers
+    assert 1 == cache.stats['evictions']
+    assert '"v2"' == cache.get(request).etag
+
+
+def test_least_recently_used_entry_is_evicted(make_request, make_response):
+    cache = ResponseCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.store(make_request("http://stub/" + name), make_response(headers={'ETag': name}))
+    cache.get(make_request("http://stub/a"))
+    cache.store(make_request("http://stub/c"), make_response(headers={'ETag': 'c'}))
+
+    assert cache.get(make_request("http://stub/a")) is not None
+    assert cache.get(make_request("http://stub/b")) is None
+    assert cache.get(make_request("http://stub/c")) is not None
+    assert 1 == cache.stats['evictions']
+
+
+def test_response_without_validators_is_not_stored(make_request, make_response):
+    cache = ResponseCache()
+    cache.store(make_request(), make_response())
+
+    assert 0 == cache.stats['entries']
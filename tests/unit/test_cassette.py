@@ -0,0 +1,89 @@
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from github_sdk import Cassette, CassetteError
+from github_sdk import cassette as cassette_module
+from github_sdk.cassette import CassetteAdapter
+
+
+def _session(cassette: Cassette) -> requests.Session:
+    session = requests.Session()
+    session.mount('http://', CassetteAdapter(cassette, HTTPAdapter()))
+    return session
+
+
+def test_recorded_responses_are_replayed_without_network(stub, tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recorder = Cassette(path, mode='record')
+    session = _session(recorder)
+    recorded = session.get(stub.url + "/user")
+    session.post(stub.url + "/repos/owner/repo/issues", json={'title': 'First'})
+    session.post(stub.url + "/repos/owner/repo/issues", json={'title': 'First'})
+    recorder.save()
+    stub.stop()
+
+    player = Cassette(path)
+    session = _session(player)
+    replayed = session.get(stub.url + "/user")
+    first = session.post(stub.url + "/repos/owner/repo/issues", json={'title': 'First'})
+    second = session.post(stub.url + "/repos/owner/repo/issues", json={'title': 'First'})
+
+    assert recorded.status_code == replayed.status_code
+    assert recorded.json() == replayed.json()
+    # Identical requests are answered in recorded order
+    assert [1, 2] == [first.json()['number'], second.json()['number']]
+    assert 3 == player.played
+
+
+def test_streamed_body_is_recorded_when_read(stub, tmp_path):
+    recorder = Cassette(str(tmp_path / "cassette.jsonl.gz"), mode='record')
+    session = _session(recorder)
+    response = session.get(stub.url + "/user", stream=True)
+    assert 0 == recorder.recorded
+
+    body = b"".join(response.iter_content(7))
+    assert 1 == recorder.recorded
+
+    session.get(stub.url + "/user", stream=True).close()
+    assert 1 == recorder.recorded
+    recorder.save()
+    assert body == _session(Cassette(recorder.path)).get(stub.url + "/user").content
+
+
+def test_large_body_is_spooled_and_replayed(stub, tmp_path, monkeypatch):
+    """Bodies above spool size are encoded to cassette chunk by chunk"""
+    monkeypatch.setattr(cassette_module, '_SPOOL_SIZE', 16)
+    monkeypatch.setattr(cassette_module, '_BASE64_CHUNK', 3 * 4)
+    recorder = Cassette(str(tmp_path / "cassette.jsonl.gz"), mode='record')
+    session = _session(recorder)
+    recorded = session.get(stub.url + "/user", stream=True)
+    body = b"".join(recorded.iter_content(5))
+    assert 16 < len(body)
+    recorder.save()
+
+    # Recording continues after save and is appended to the saved cassette
+    session.get(stub.url + "/repos/owner/repo/issues")
+    recorder.save()
+    assert 2 == recorder.recorded
+
+    player = Cassette(recorder.path)
+    assert body == _session(player).get(stub.url + "/user").content
+    assert 200 == _session(player).get(stub.url + "/repos/owner/repo/issues").status_code
+
+
+def test_strict_cassette_rejects_unrecorded_request(stub, tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    Cassette(path, mode='record').save()
+
+    with pytest.raises(CassetteError):
+        _session(Cassette(path, strict=True)).get(stub.url + "/user")
+
+    player = Cassette(path, strict=False)
+    assert 200 == _session(player).get(stub.url + "/user").status_code
+    assert 1 == player.missed
+
+
+def test_missing_cassette_is_not_replayed(tmp_path):
+    with pytest.raises(CassetteError):
+        Cassette(str(tmp_path / "missing.jsonl.gz"))
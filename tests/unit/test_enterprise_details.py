@@ -0,0 +1,90 @@
+import io
+import logging
+import os
+import tarfile
+
+import pytest
+
+from sdk.utils_sdk.utils_sdk.utils import ENTERPRISE_DETAILS_SEPARATOR, _iter_enterprise_details, \
+    get_enterprise_details, get_enterprise_details_many
+
+DETAILS = "\n".join([
+    "IP:\t\t\t10.15.0.33",
+    "fqdn:\t\t\teuropalviv.imp.eng",
+    ENTERPRISE_DETAILS_SEPARATOR,
+    "IP:\t\t\t10.15.0.34",
+    "fqdn:\t\t\teuropakyiv.imp.eng",
+    ENTERPRISE_DETAILS_SEPARATOR,
+])
+
+
+def _archive(path, files: dict, mode: str = "w:gz") -> str:
+    with tarfile.open(str(path), mode) as archive:
+        for name, content in files.items():
+            data = content.encode()
+            member = tarfile.TarInfo(name)
+            member.size = len(data)
+            archive.addfile(member, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.fixture()
+def make_archive(tmp_path):
+    """
+    Factory writing tar archive with given files to tmp_path
+    """
+    return lambda name, files, mode="w:gz": _archive(tmp_path / name, files, mode)
+
+
+def test_details_are_read_from_top_level_file(make_archive, tmp_path):
+    archive = make_archive("support.tar.gz", {"logs/enterpriseDetails_old.txt": "IP:\t1.1.1.1\n",
+                                              "appliance.log": "x" * 1000,
+                                              "enterpriseDetails_20220505.txt": DETAILS})
+
+    details = get_enterprise_details(archive)
+
+    assert ["10.15.0.33", "10.15.0.34"] == [appliance["IP"] for appliance in details]
+    # Archive is not unpacked next to itself
+    assert ["support.tar.gz"] == os.listdir(str(tmp_path))
+
+
+def test_uncompressed_archive_is_read(make_archive):
+    archive = make_archive("support.tar", {"enterpriseDetails.txt": DETAILS}, mode="w")
+
+    assert 2 == len(get_enterprise_details(archive))
+
+
+def test_archive_without_details_is_logged(make_archive, caplog):
+    archive = make_archive("support.tar.gz", {"appliance.log": "IP:\t1.1.1.1\n"})
+
+    with caplog.at_level(logging.WARNING):
+        assert get_enterprise_details(archive) is None
+    assert "enterpriseDetails" in caplog.text
+
+
+def test_parser_yields_appliance_when_its_block_ends():
+    lines = iter(["Time: 10:15:00", "IPv6:  fe80::1", ENTERPRISE_DETAILS_SEPARATOR, ENTERPRISE_DETAILS_SEPARATOR,
+                  "IP: 10.15.0.34"])
+    appliances = _iter_enterprise_details(lines)
+
+    assert {'Time': "10:15:00", 'IPv6': "fe80::1"} == next(appliances)
+    # Lines after the first block are not read before the next appliance is requested
+    assert [ENTERPRISE_DETAILS_SEPARATOR, "IP: 10.15.0.34"] == list(lines)
+
+
+def test_parser_skips_empty_blocks():
+    lines = [ENTERPRISE_DETAILS_SEPARATOR, "IP: 10.15.0.33", ENTERPRISE_DETAILS_SEPARATOR, "",
+             ENTERPRISE_DETAILS_SEPARATOR, "IP: 10.15.0.34"]
+
+    assert [{'IP': "10.15.0.33"}, {'IP': "10.15.0.34"}] == list(_iter_enterprise_details(lines))
+
+
+def test_many_archives_keep_order(make_archive):
+    archives = [make_archive("first.tar.gz", {"enterpriseDetails.txt": DETAILS}),
+                make_archive("broken.tar.gz", {"appliance.log": ""}),
+                make_archive("second.tar.gz", {"enterpriseDetails.txt": "IP:\t10.0.0.1\n"})]
+
+    details = get_enterprise_details_many(archives, workers=2)
+
+    assert [2, None, 1] == [len(item) if item is not None else None for item in details]
+    assert [] == get_enterprise_details_many([])
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from github_sdk.resources.graphql import GraphQL
+
+
+class _GraphQLServer(BaseAdapter):
+    """
+    Transport answering every request with the same GraphQL body and remembering sent queries
+    """
+
+    def __init__(self, body: dict, make_response):
+        super().__init__()
+        self.body = body
+        self.make_response = make_response
+        self.queries = []
+
+    def send(self, request, **kwargs):
+        self.queries.append(json.loads(request.body)['query'])
+        response = self.make_response(200, {'Content-Type': 'application/json'}, json.dumps(self.body).encode())
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+BODY = {'data': {'me': {'login': 'octo', 'id': 'U1'},
+                 'issue': {'issue': {'number': 1, 'state': 'OPEN'}},
+                 'branch': {'ref': None}},
+        'errors': [{'path': ['branch', 'ref'], 'message': 'Could not resolve to a Ref'}]}
+
+
+@pytest.fixture()
+def server(make_response) -> _GraphQLServer:
+    return _GraphQLServer(BODY, make_response)
+
+
+def _graphql(server: _GraphQLServer, hostname: str = "https://api.github.com") -> GraphQL:
+    session = requests.Session()
+    session.mount('https://', server)
+    return GraphQL(hostname, "token", session)
+
+
+def test_batch_sends_one_aliased_query(server):
+    results = _graphql(server).batch({'me': GraphQL.viewer(), 'issue': GraphQL.issue("octo", "hello", 1),
+                                      'branch': GraphQL.branch("octo", "hello", "demo")})
+
+    assert 1 == len(server.queries)
+    assert server.queries[0].startswith("query { me: viewer {")
+    assert 'issue: repository(owner: "octo", name: "hello") { issue(number: 1) {' in server.queries[0]
+    assert 'ref(qualifiedName: "refs/heads/demo")' in server.queries[0]
+    assert {'login': 'octo', 'id': 'U1'} == results['me'].json
+    assert {'number': 1, 'state': 'OPEN'} == results['issue'].json
+    assert results['me'].ok and results['issue'].ok
+    assert not results['branch'].ok
+    assert ['Could not resolve to a Ref'] == [error['message'] for error in results['branch'].errors]
+
+
+@pytest.mark.parametrize("hostname, url", [("https://api.github.com", "https://api.github.com/graphql"),
+                                           ("https://ghe.local/api/v3", "https://ghe.local/api/graphql")])
+def test_graphql_url(hostname, url, server):
+    assert url == _graphql(server, hostname).url
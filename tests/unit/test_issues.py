@@ -0,0 +1,35 @@
+import logging
+
+from github_sdk.pool import SessionPool
+from github_sdk.resources.issues import Issues
+from execution_utils.stub_server import StubServer
+
+
+def _issues(stub: StubServer, pool: SessionPool) -> Issues:
+    return Issues(stub.url, "token", pool.get_session(stub.url, "token"))
+
+
+def test_bulk_creation_reuses_pooled_connections(caplog):
+    pool = SessionPool()
+    pool.configure(pool_maxsize=2)
+    with StubServer(latency=0.02) as stub, caplog.at_level(logging.WARNING, logger="urllib3"):
+        responses = list(_issues(stub, pool).create_issues_bulk(
+            "owner", "repo", ({'title': "Issue {}".format(number), 'body': "Body", 'assignees': "stub-user",
+                               'labels': "bug"} for number in range(16)), concurrency=8))
+        connection_pool = pool._adapters[(stub.url, "token")].poolmanager.connection_from_url(stub.url)
+
+    assert list(range(1, 17)) == sorted(response.json['number'] for response in responses)
+    assert connection_pool.num_connections <= 2
+    assert not [record for record in caplog.records if "pool is full" in record.getMessage()]
+
+
+def test_bulk_creation_skips_failed_issues():
+    failed = []
+    with StubServer() as stub:
+        responses = list(_issues(stub, SessionPool()).create_issues_bulk(
+            "owner", "repo", [{'title': "First", 'body': "", 'assignees': "stub-user", 'labels': "bug"},
+                              {'title': "Second", 'body': "", 'assignees': "stub-user"}],
+            on_error=lambda spec, error: failed.append(spec['title'])))
+
+    assert [201] == [response.status_code for response in responses]
+    assert ["Second"] == failed
@@ -0,0 +1,42 @@
+import time
+
+from execution_utils.load_runner import LoadRunner, parse_mix
+from execution_utils.stub_server import StubServer
+from utils_sdk import Properties
+
+
+def _properties(url: str) -> Properties:
+    properties = Properties()
+    properties.github_url = url
+    properties.github_token = "token"
+    properties.assignees = "owner"
+    properties.repo = "repo"
+    return properties
+
+
+def test_parse_mix():
+    assert {'get_user': 8.0, 'list_issues': 1.0} == parse_mix("get_user=8, list_issues,")
+
+
+def test_saturated_runner_stops_at_duration():
+    """Calls the runner could not send before the deadline are counted as missed"""
+    with StubServer(latency=0.1) as server:
+        runner = LoadRunner(_properties(server.url), mix="get_user", rate=50, concurrency=1, duration=1)
+        start = time.perf_counter()
+        report = runner.run()
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert 50 == report['scheduled']
+    assert report['count'] <= 11
+    assert report['scheduled'] - report['count'] == report['missed']
+    assert 30 < report['missed']
+
+
+def test_unsaturated_runner_sends_schedule():
+    with StubServer() as server:
+        report = LoadRunner(_properties(server.url), mix="get_user", rate=20, concurrency=2, duration=0.5).run()
+
+    assert 10 == report['count']
+    assert 0 == report['missed']
+    assert 0 == report['endpoints']['get_user']['errors']
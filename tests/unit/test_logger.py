@@ -0,0 +1,66 @@
+import logging
+import queue
+
+import pytest
+
+from execution_utils import logger
+from execution_utils.logger import BoundedQueueHandler
+
+
+@pytest.fixture()
+def root_logger(tmp_path, monkeypatch):
+    """
+    Root logger restored after test, log files are written to tmp_path
+    """
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    handlers, level = root.handlers, root.level
+    yield root
+    logger.shutdown()
+    for handler in root.handlers:
+        handler.close()
+    root.handlers, root.level = handlers, level
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("unit", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_full_queue_drops_records():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+    for number in range(3):
+        handler.handle(_record("record {}".format(number)))
+
+    assert 2 == handler.dropped
+    assert "record 0" == handler.queue.get_nowait().getMessage()
+
+
+@pytest.mark.parametrize("queue_mode", ["off", "drop", "block"])
+def test_records_are_written_to_info_and_debug_files(root_logger, tmp_path, queue_mode):
+    logger.initialize("config_unit.ini", queue_mode=queue_mode, queue_size=100)
+    logging.debug("Debug record")
+    logging.info("Info record")
+    logger.shutdown()
+
+    info, debug = (tmp_path / "info_unit.log").read_text(), (tmp_path / "debug_unit.log").read_text()
+    assert "Info record" in info and "Debug record" not in info
+    assert "Info record" in debug and "Debug record" in debug
+
+
+def test_initialize_again_closes_previous_files(root_logger, tmp_path):
+    logger.initialize("config_unit.ini", queue_mode="block")
+    previous = logger._listener.handlers
+    logger.initialize("config_unit.ini", suffix="_w1")
+    logging.info("Worker record")
+
+    assert all(handler.stream is None for handler in previous)
+    assert "Worker record" not in (tmp_path / "info_unit.log").read_text()
+    assert "Worker record" in (tmp_path / "info_unit_w1.log").read_text()
+
+
+def test_dropped_records_are_reported(root_logger, tmp_path):
+    logger.initialize("config_unit.ini", queue_mode="drop", queue_size=1)
+    root_logger.handlers[0].dropped = 5
+    logger.shutdown()
+
+    assert "5 log records were dropped" in (tmp_path / "info_unit.log").read_text()
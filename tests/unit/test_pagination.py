@@ -0,0 +1,31 @@
+import pytest
+
+from github_sdk import GITHUB, ResponseCache
+
+
+@pytest.fixture()
+def github_api(stub) -> GITHUB:
+    """
+    Client with response cache and 120 issues in owner/repo
+    """
+    github_api = GITHUB(stub.url, "token", cache=ResponseCache(), shared_pool=False)
+    list(github_api.issues.create_issues_bulk(
+        "owner", "repo", ({'title': "Issue {}".format(number), 'body': "", 'assignees': "stub-user",
+                           'labels': "bug"} for number in range(120))))
+    return github_api
+
+
+def test_iter_issues_follows_all_pages(github_api):
+    numbers = [issue['number'] for issue in github_api.issues.iter_issues("owner", "repo", per_page=25)]
+
+    assert list(range(1, 121)) == sorted(numbers)
+
+
+def test_pages_are_not_cached(github_api):
+    list(github_api.issues.iter_issues("owner", "repo", per_page=25))
+    list(github_api.branch.iter_branches("owner", "repo", per_page=1))
+
+    assert 0 == github_api.cache.stats['entries']
+    github_api.user.get_user()
+    assert 1 == github_api.cache.stats['entries']
+
@@ -0,0 +1,133 @@
+import filecmp
+
+import pytest
+
+from execution_utils.configurators.property_configurator import Dataset, PropertyConfigurator, generate_dataset, \
+    is_dataset_current
+from github_sdk import GITHUB
+from utils_sdk import Properties
+
+
+@pytest.fixture()
+def configurator(properties, tmp_path, monkeypatch):
+    """
+    PropertyConfigurator with snapshot in tmp_path and data properties of stub repository
+    """
+    for name, value in {'assignees': "owner", 'repo': "repo", 'data_issues': "3", 'data_labels': "0",
+                        'data_seed': "7", 'data_batch_size': "1000"}.items():
+        setattr(properties, name, value)
+    snapshot = str(tmp_path / "config.json")
+    monkeypatch.setattr(PropertyConfigurator, '_json_file', snapshot)
+    monkeypatch.setattr(PropertyConfigurator, '_save_file', snapshot)
+    monkeypatch.setattr(PropertyConfigurator, '_test_data', Properties())
+    monkeypatch.setattr(PropertyConfigurator, '_validated', set())
+    return PropertyConfigurator
+
+
+def _next_execution(configurator):
+    """Start new execution with --reuse: snapshot is read back and its items are not validated yet"""
+    test_data = Properties()
+    test_data.deserialize(configurator._json_file)
+    configurator._test_data = test_data
+    configurator._validated = set()
+
+
+def _issue_count(github_api) -> int:
+    return len(github_api.issues.list_issues("owner", "repo", state='all').json)
+
+
+def test_seeded_issues_are_reused_while_open(configurator, stub):
+    github_api = GITHUB(stub.url, "token", shared_pool=False)
+
+    assert [1, 2, 3] == configurator.seeded_issues(github_api)
+    _next_execution(configurator)
+    assert [1, 2, 3] == configurator.seeded_issues(github_api)
+    assert 3 == _issue_count(github_api)
+
+    github_api.issues.close_issue("owner", "repo", 2)
+    _next_execution(configurator)
+    assert [4, 5, 6] == configurator.seeded_issues(github_api)
+    assert 6 == _issue_count(github_api)
+
+
+def test_no_issues_are_seeded_without_dataset(configurator, properties, stub):
+    properties.data_issues = "0"
+    github_api = GITHUB(stub.url, "token", shared_pool=False)
+
+    assert [] == configurator.seeded_issues(github_api)
+    assert 0 == _issue_count(github_api)
+
+
+def test_seeded_branch_is_checked_once_per_execution(configurator, stub):
+    github_api = GITHUB(stub.url, "token", shared_pool=False)
+    requests = list()
+    github_api.add_hook("before_request", requests.append)
+
+    assert "demo" == configurator.seeded_branch(github_api, "demo")
+    assert "demo" == configurator.seeded_branch(github_api, "demo")
+    assert 1 == len(requests)
+
+    github_api.branch.rename_branch("owner", "repo", "demo", "demo_edit")
+    _next_execution(configurator)
+    with pytest.raises(ValueError):
+        configurator.seeded_branch(github_api, "demo")
+
+
+def test_same_seed_gives_same_dataset(tmp_path):
+    first = str(tmp_path / "first" / "issues.jsonl")
+    second = str(tmp_path / "second" / "issues.jsonl")
+    generate_dataset(first, "issues", 250, seed=42, batch_size=100, owner="stub-user", labels=5)
+    generate_dataset(second, "issues", 250, seed=42, batch_size=100, owner="stub-user", labels=5)
+
+    assert filecmp.cmp(first, second, shallow=False)
+    assert filecmp.cmp(first.replace('.jsonl', '.idx'), second.replace('.jsonl', '.idx'), shallow=False)
+
+
+def test_other_seed_gives_other_dataset(tmp_path):
+    first = str(tmp_path / "first" / "users.jsonl")
+    second = str(tmp_path / "second" / "users.jsonl")
+    generate_dataset(first, "users", 50, seed=1)
+    generate_dataset(second, "users", 50, seed=2)
+
+    assert list(Dataset(first)) != list(Dataset(second))
+
+
+def test_dataset_index(tmp_path):
+    path = str(tmp_path / "repos.jsonl")
+    generate_dataset(path, "repos", 120, seed=7, batch_size=50, owner="stub-user")
+    dataset = Dataset(path)
+    records = list(dataset)
+
+    assert 120 == len(dataset)
+    assert records[0] == dataset[0]
+    assert records[77] == dataset[77]
+    assert records[-1] == dataset[-1]
+
+
+def test_dataset_is_current_only_for_same_parameters(tmp_path):
+    path = str(tmp_path / "labels.jsonl")
+    generate_dataset(path, "labels", 10, seed=3)
+
+    assert is_dataset_current(path, "labels", 10, seed=3)
+    assert not is_dataset_current(path, "labels", 11, seed=3)
+    assert not is_dataset_current(path, "labels", 10, seed=4)
+    assert not is_dataset_current(str(tmp_path / "missing.jsonl"), "labels", 10, seed=3)
+
+
+def test_interrupted_dataset_is_not_current(tmp_path):
+    path = str(tmp_path / "issues.jsonl")
+    generate_dataset(path, "issues", 10, seed=3, owner="stub-user")
+    (tmp_path / "issues.meta.json").unlink()
+
+    assert not is_dataset_current(path, "issues", 10, seed=3, owner="stub-user")
+
+
+def test_configurator_dataset_is_generated_once(configurator, tmp_path):
+    first = configurator.dataset("issues")
+    modified = (tmp_path / "config_issues.jsonl").stat().st_mtime_ns
+    second = configurator.dataset("issues")
+
+    assert 3 == len(second)
+    assert "owner" == second[2]['assignees']
+    assert first[2] == second[2]
+    assert modified == (tmp_path / "config_issues.jsonl").stat().st_mtime_ns
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from utils_sdk import PropertyError, get_property, set_properties, set_property
+from utils_sdk.property_manager import _read_config
+
+
+@pytest.fixture()
+def config_file(tmp_path) -> str:
+    path = tmp_path / "config.ini"
+    path.write_text("[github]\ngithub_url = http://stub\nMixedCase = kept\n\n[execution]\nworkers = 2\n")
+    return str(path)
+
+
+def test_parsed_config_is_cached(config_file):
+    assert _read_config(config_file) is _read_config(config_file)
+    assert "2" == get_property(config_file, "workers")
+    assert "kept" == get_property(config_file, "MixedCase", "github")
+
+
+def test_changed_config_is_parsed_again(config_file):
+    cached = _read_config(config_file)
+    with open(config_file, 'a') as configfile:
+        configfile.write("load_rate = 10\n")
+
+    assert cached is not _read_config(config_file)
+    assert "10" == get_property(config_file, "load_rate")
+
+
+def test_set_properties_writes_all_values_at_once(config_file):
+    os.chmod(config_file, 0o640)
+    set_properties(config_file, {'github_url': "http://other", 'workers': "4", 'unknown': "ignored"})
+    set_property(config_file, "MixedCase", "changed", "github")
+
+    assert ["config.ini"] == os.listdir(os.path.dirname(config_file))
+    assert 0o640 == os.stat(config_file).st_mode & 0o777
+    assert ("http://other", "4", "changed") == tuple(get_property(config_file, name)
+                                                     for name in ("github_url", "workers", "MixedCase"))
+    with pytest.raises(PropertyError):
+        get_property(config_file, "unknown")
+
+
+def test_missing_config_is_rejected(tmp_path):
+    missing = str(tmp_path / "missing.ini")
+    with pytest.raises(PropertyError):
+        get_property(missing, "github_url")
+    with pytest.raises(PropertyError):
+        set_properties(missing, {'github_url': "http://stub"})
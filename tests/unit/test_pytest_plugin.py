@@ -0,0 +1,70 @@
+import pytest
+
+from execution_utils.pytest_plugin import CleanupRegistry
+
+pytest_plugins = ["pytester"]
+
+
+def test_cleanup_actions_run_in_reverse_order_after_failure():
+    calls = list()
+    registry = CleanupRegistry()
+    registry.add(calls.append, "first")
+    registry.add(lambda: 1 / 0)
+    registry.add(calls.append, "last")
+
+    with pytest.raises(ZeroDivisionError):
+        registry.run()
+    assert ["last", "first"] == calls
+
+    registry.run()
+    assert ["last", "first"] == calls
+
+
+@pytest.fixture()
+def stub_properties(properties, stub):
+    properties.github_url = stub.url
+    properties.github_token = "token"
+    properties.cleanup_created_resources = "false"
+    return properties
+
+
+SHARED_CLIENT_TESTS = """
+import pytest
+
+CLIENTS = []
+
+
+@pytest.mark.parametrize("number", [1, 2])
+def test_client(github_api, number):
+    CLIENTS.append(github_api)
+    assert 200 == github_api.user.get_user().status_code
+    assert len(set(map(id, CLIENTS))) == 1
+    assert (github_api.rate_limiter is not None) == {rate_limited}
+"""
+
+
+@pytest.mark.parametrize("rate_limit", ["true", "false"])
+def test_github_api_is_shared_by_session(pytester, stub_properties, rate_limit):
+    stub_properties.rate_limit = rate_limit
+    pytester.makepyfile(SHARED_CLIENT_TESTS.format(rate_limited=rate_limit == "true"))
+
+    result = pytester.inline_run("-p", "execution_utils.pytest_plugin", "-p", "no:cacheprovider")
+
+    result.assertoutcome(passed=2)
+
+
+def test_cleanup_runs_when_test_fails(pytester, stub_properties):
+    pytester.makepyfile("""
+        def test_rename(github_api, cleanup):
+            github_api.branch.rename_branch("owner", "repo", "demo", "demo_edit")
+            cleanup.add(github_api.branch.rename_branch, "owner", "repo", "demo_edit", "demo")
+            assert False
+
+
+        def test_branch_is_renamed_back(github_api):
+            assert "demo" in [branch["name"] for branch in github_api.branch.iter_branches("owner", "repo")]
+    """)
+
+    result = pytester.inline_run("-p", "execution_utils.pytest_plugin", "-p", "no:cacheprovider")
+
+    result.assertoutcome(passed=1, failed=1)
@@ -0,0 +1,87 @@
+import email.utils
+import time
+
+import pytest
+
+from execution_utils.stub_server import StubServer
+from github_sdk import GITHUB, RateLimiter
+from github_sdk import rate_limit
+
+
+@pytest.fixture()
+def sleeps(monkeypatch) -> list:
+    """
+    Record waits of rate limiter instead of sleeping
+    """
+    waits = []
+    monkeypatch.setattr(rate_limit.time, 'sleep', waits.append)
+    return waits
+
+
+def _budget(limit: int, remaining: int, reset_in: int) -> dict:
+    return {'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(int(time.time()) + reset_in)}
+
+
+def test_requests_are_not_paced_above_threshold(sleeps, make_request, make_response):
+    limiter = RateLimiter(pace_below=0.5)
+    limiter.update(make_response(headers=_budget(100, 90, 100)))
+    for _ in range(5):
+        limiter.send(lambda request, **kwargs: make_response(), make_request())
+
+    assert [] == sleeps
+    assert 85 == limiter.remaining
+
+
+def test_requests_are_spread_until_reset(sleeps, make_request, make_response):
+    limiter = RateLimiter(pace_below=0.5)
+    limiter.update(make_response(headers=_budget(100, 10, 100)))
+    for _ in range(3):
+        limiter.send(lambda request, **kwargs: make_response(), make_request())
+
+    # Slots are window / budget apart: about 100 / 9 and 100 / 8 seconds
+    assert 2 == len(sleeps)
+    assert 9 < sleeps[0] < 12
+    assert 20 < sleeps[1] < 25
+
+
+def test_secondary_rate_limit_is_waited_out(sleeps, make_request, make_response):
+    responses = [make_response(403, {'Retry-After': '2'}), make_response(200)]
+    limiter = RateLimiter()
+    response = limiter.send(lambda request, **kwargs: responses.pop(0), make_request())
+
+    assert 200 == response.status_code
+    assert [2.0] == sleeps
+    assert 1 == limiter.stats['secondary_limits']
+
+
+def test_secondary_rate_limit_longer_than_max_wait_is_returned(sleeps, make_request, make_response):
+    limiter = RateLimiter(max_wait=10)
+    response = limiter.send(lambda request, **kwargs: make_response(429, {'Retry-After': '60'}), make_request())
+
+    assert 429 == response.status_code
+    assert [] == sleeps
+
+
+@pytest.mark.parametrize("value, expected", [("5", 5.0), ("-3", 0.0), ("soon", rate_limit.DEFAULT_WAIT),
+                                             ("", rate_limit.DEFAULT_WAIT)])
+def test_retry_after_header(value, expected, make_response):
+    assert expected == RateLimiter.retry_after(make_response(403, {'Retry-After': value}))
+
+
+def test_retry_after_http_date(make_response):
+    value = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert 28 < RateLimiter.retry_after(make_response(429, {'Retry-After': value})) <= 30
+
+
+def test_exhausted_budget_is_waited_until_reset():
+    """
+    Stand-in server allows 3 requests per second, the rest would be answered with 403 without pacing
+    """
+    with StubServer(rate_limit=3, rate_limit_window=1) as stub:
+        github_api = GITHUB(stub.url, "token", rate_limiter=RateLimiter(), shared_pool=False)
+        responses = [github_api.user.get_user() for _ in range(5)]
+
+    assert [200] * 5 == [response.status_code for response in responses]
+    assert 1 <= github_api.rate_limiter.stats['throttled']
@@ -0,0 +1,137 @@
+import gzip
+import io
+import json
+import logging
+
+import pytest
+import requests
+
+from github_sdk.responses import response as response_module
+from github_sdk.responses.graphql_response import GraphQLResponse
+from github_sdk.responses.response import Response
+
+
+def _streamed(body: bytes) -> Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.encoding = 'utf-8'
+    response.url = "http://stub/archive"
+    return Response(response)
+
+
+BODY = json.dumps({'name': 'demo', 'note': 'with "quotes" and {braces}', 'list': [1, {'login': 'x'}],
+                   'commit': {'sha': 'abc', 'author': {'login': 'stub-user', 'id': 1}}}).encode()
+
+
+@pytest.mark.parametrize("keys, expected", [
+    (('name',), 'demo'), (('commit', 'author', 'login'), 'stub-user'),
+    (('commit', 'author'), {'login': 'stub-user', 'id': 1}), (('list',), [1, {'login': 'x'}]),
+    (('login',), None), (('commit', 'missing'), None), (('name', 'nested'), None)])
+def test_get_field(keys, expected, make_response):
+    assert expected == Response(make_response(body=BODY)).get_field(*keys)
+
+    decoded = Response(make_response(body=BODY))
+    assert decoded.json
+    assert expected == decoded.get_field(*keys)
+
+
+def test_get_field_default(make_response):
+    assert 'none' == Response(make_response(body=BODY)).get_field('missing', default='none')
+
+
+def test_get_field_decodes_body_after_large_member(make_response, monkeypatch):
+    body = json.dumps({'items': [{'id': number, 'title': 'x' * 20} for number in range(100)],
+                       'commit': {'author': {'login': 'octo'}}}).encode()
+    monkeypatch.setattr(response_module, '_MAX_SKIP', 1024)
+    response = Response(make_response(body=body))
+
+    assert 'octo' == response.get_field('commit', 'author', 'login')
+    # Body was decoded once and is reused
+    assert response._json is not response_module._UNSET
+    assert response.get_field('missing') is None
+
+
+def test_get_field_scans_past_small_members(make_response):
+    response = Response(make_response(body=BODY))
+
+    assert 'stub-user' == response.get_field('commit', 'author', 'login')
+    assert response._json is response_module._UNSET
+
+
+def test_graphql_get_field_reads_lookup_data(make_response):
+    batch = make_response(body=json.dumps({'data': {'me': {'login': 'octo', 'owner': {'login': 'org'}}}}).encode())
+    response = GraphQLResponse(batch, 'me', {'login': 'octo', 'owner': {'login': 'org'}}, [])
+
+    assert {'login': 'octo', 'owner': {'login': 'org'}} == response.json
+    assert 'octo' == response.get_field('login')
+    assert 'org' == response.get_field('owner', 'login')
+    assert 'none' == response.get_field('data', default='none')
+    assert GraphQLResponse(batch, 'me', None, []).get_field('login') is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_iter_json_array(chunk_size):
+    items = [1, 23456, -7.5, "a, ] b", {'title': 'x', 'labels': [1, 2]}, [], None, True]
+    body = json.dumps(items, indent=1).encode()
+
+    assert items == list(_streamed(body).iter_json_array(chunk_size))
+
+
+def test_iter_json_array_many_items_in_one_chunk():
+    items = [{'number': number} for number in range(20000)]
+    body = json.dumps(items).encode()
+
+    assert items == list(_streamed(body).iter_json_array(len(body)))
+
+
+def test_iter_json_array_multibyte_characters():
+    items = [{'title': 'ünïcödé ✓'}] * 3
+
+    assert items == list(_streamed(json.dumps(items, ensure_ascii=False).encode()).iter_json_array(1))
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b'[1, 2', b'[{"a": 1}'])
+def test_iter_json_array_invalid(body):
+    with pytest.raises(ValueError):
+        list(_streamed(body).iter_json_array(2))
+
+
+def test_save_to(tmp_path):
+    body = bytes(range(256)) * 1000
+    path = str(tmp_path / "archive.tar.gz")
+
+    assert len(body) == _streamed(body).save_to(path, chunk_size=4096)
+    with open(path, 'rb') as archive_file:
+        assert body == archive_file.read()
+    assert [4096, 4096] == [len(chunk) for chunk in _streamed(body[:8192]).iter_bytes(4096)]
+
+
+def test_log_payload_is_formatted_once(make_response, caplog, monkeypatch):
+    decoded = list()
+    monkeypatch.setattr(response_module, '_json_loads', lambda body: decoded.append(body) or json.loads(body))
+    response = Response(make_response(body=BODY))
+
+    with caplog.at_level(logging.WARNING):
+        response.log_payload()
+    assert [] == decoded
+
+    with caplog.at_level(logging.INFO):
+        response.log_payload(max_bytes=0)
+    assert json.dumps(json.loads(BODY), indent=4, sort_keys=True) == caplog.records[-1].getMessage()
+    caplog.records[-1].getMessage()
+    assert 1 == len(decoded)
+
+
+def test_log_payload_truncates_large_body(make_response, caplog, tmp_path):
+    response = Response(make_response(body=BODY))
+
+    with caplog.at_level(logging.INFO):
+        response.log_payload(max_bytes=16, sidecar_path=str(tmp_path))
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith(BODY[:16].decode() + "... <16 of {} bytes>".format(len(BODY)))
+    sidecar_file, = tmp_path.iterdir()
+    assert str(sidecar_file) in message
+    with gzip.open(str(sidecar_file), 'rb') as payload_file:
+        assert BODY == payload_file.read()
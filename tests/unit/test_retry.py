@@ -0,0 +1,114 @@
+from typing import Callable
+
+import pytest
+import requests
+
+from execution_utils.stub_server import StubServer
+from github_sdk import GITHUB, RetryPolicy
+from github_sdk import retry
+from github_sdk.resources.issues import Issues
+from github_sdk.retry import IDEMPOTENT_HEADER
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch) -> list:
+    """
+    Record backoff delays instead of sleeping
+    """
+    waits = []
+    monkeypatch.setattr(retry.time, 'sleep', waits.append)
+    return waits
+
+
+class _Server:
+    """
+    Send function answering with given status codes and counting calls
+    """
+
+    def __init__(self, make_response: Callable[..., requests.Response], *statuses: int, headers: dict = None):
+        self.make_response = make_response
+        self.statuses = list(statuses)
+        self.headers = headers
+        self.calls = 0
+
+    def __call__(self, request, **kwargs):
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return self.make_response(status, self.headers)
+
+
+@pytest.mark.parametrize("method, idempotent, calls", [
+    ('GET', None, 4), ('PUT', None, 4), ('POST', None, 1), ('PATCH', None, 1),
+    ('POST', True, 4), ('GET', False, 1)])
+def test_methods_are_gated(method, idempotent, calls, make_request, make_response):
+    server = _Server(make_response, 503)
+    response = RetryPolicy(max_attempts=4).send(server, make_request(method=method), idempotent=idempotent)
+
+    assert 503 == response.status_code
+    assert calls == server.calls
+
+
+def test_transient_failure_is_retried(make_request, make_response):
+    server = _Server(make_response, 502, 503, 200)
+    policy = RetryPolicy()
+
+    assert 200 == policy.send(server, make_request()).status_code
+    assert {'retries': 2, 'gave_up': 0, 'reasons': {'502': 1, '503': 1}} == policy.stats
+
+
+def test_retry_is_not_started_after_budget(sleeps, make_request, make_response):
+    server = _Server(make_response, 503, headers={'Retry-After': '5'})
+    policy = RetryPolicy(total_timeout=1)
+
+    assert 503 == policy.send(server, make_request()).status_code
+    assert 1 == server.calls
+    assert [] == sleeps
+    assert 1 == policy.stats['gave_up']
+
+
+def test_connection_error_is_raised_after_all_attempts(make_request):
+    calls = []
+
+    def send(request, **kwargs):
+        calls.append(request)
+        raise requests.ConnectionError("refused")
+
+    with pytest.raises(requests.ConnectionError):
+        RetryPolicy(max_attempts=3, backoff=0).send(send, make_request())
+    assert 3 == len(calls)
+
+
+def test_resource_marks_requests_idempotent():
+    """
+    Issue creation is retried only when asked, closing issue always, renaming branch never
+    """
+    with StubServer(error_rate=1.0, error_statuses=(503,)) as stub:
+        github_api = GITHUB(stub.url, "token", retry_policy=RetryPolicy(max_attempts=2), shared_pool=False)
+        github_api.issues.create_issues("owner", "repo", "Title", "Body", "stub-user", "bug")
+        assert 0 == github_api.retry_policy.retries
+        github_api.branch.rename_branch("owner", "repo", "demo", "demo_edit")
+        assert 0 == github_api.retry_policy.retries
+        github_api.issues.create_issues("owner", "repo", "Title", "Body", "stub-user", "bug", idempotent=True)
+        assert 1 == github_api.retry_policy.retries
+        github_api.issues.close_issue("owner", "repo", 1)
+        assert 2 == github_api.retry_policy.retries
+
+
+def test_idempotent_marker_is_not_sent(stub):
+    github_api = GITHUB(stub.url, "token", retry_policy=RetryPolicy(), shared_pool=False)
+    sent = []
+    github_api.add_hook("before_request", lambda request: sent.append(dict(request.headers)))
+    github_api.issues.close_issue("owner", "repo", 1)
+
+    assert 1 == len(sent)
+    assert IDEMPOTENT_HEADER not in sent[0]
+
+
+def test_resource_over_plain_session(stub):
+    """
+    Resources built on requests.Session without GITHUB layers still accept idempotent flag
+    """
+    issues = Issues(stub.url, "token", requests.Session())
+
+    assert 201 == issues.create_issues("owner", "repo", "Title", "Body", "stub-user", "bug", idempotent=True).status_code
+    assert 200 == issues.close_issue("owner", "repo", 1).status_code
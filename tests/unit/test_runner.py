@@ -0,0 +1,156 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from execution_utils import logger, runner
+from execution_utils.configurators.property_configurator import PropertyConfigurator
+from execution_utils.runner import combine_exit_codes, merge_cleanup, merge_junit, shard_tests
+from utils_sdk import Properties
+
+
+def test_shard_tests_keeps_modules_together():
+    node_ids = ["tests/test_a.py::test_{}".format(number) for number in range(4)] + \
+               ["tests/test_b.py::test_1", "tests/test_b.py::test_2", "tests/test_c.py::test_1"]
+
+    shards = shard_tests(node_ids, 2)
+
+    assert sorted(node_ids) == sorted(node_id for shard in shards for node_id in shard)
+    assert [4, 3] == [len(shard) for shard in shards]
+    for module in ("test_a", "test_b", "test_c"):
+        assert 1 == sum(1 for shard in shards if any(module in node_id for node_id in shard))
+
+
+def test_shard_tests_skips_empty_shards():
+    assert [["tests/test_a.py::test_1"]] == shard_tests(["tests/test_a.py::test_1"], 4)
+
+
+def _junit(path, tests: int, failures: int, time: float):
+    suite = ElementTree.Element("testsuite", name="pytest", tests=str(tests), failures=str(failures), errors="0",
+                                skipped="0", time=str(time), timestamp="2022-05-05T10:00:00")
+    for number in range(tests):
+        ElementTree.SubElement(suite, "testcase", name="test_{}".format(number))
+    testsuites = ElementTree.Element("testsuites")
+    testsuites.append(suite)
+    ElementTree.ElementTree(testsuites).write(str(path))
+
+
+def test_merge_junit(tmp_path):
+    _junit(tmp_path / "report_w0.xml", 3, 1, 2.5)
+    _junit(tmp_path / "report_w1.xml", 2, 0, 4.0)
+
+    merge_junit([str(tmp_path / "report_w0.xml"), str(tmp_path / "report_w1.xml"),
+                 str(tmp_path / "report_w2.xml")], str(tmp_path / "report.xml"))
+
+    suite = ElementTree.parse(str(tmp_path / "report.xml")).getroot().find("testsuite")
+    assert {'tests': '5', 'failures': '1', 'errors': '0', 'skipped': '0', 'time': '4.000'} == \
+        {key: suite.get(key) for key in ('tests', 'failures', 'errors', 'skipped', 'time')}
+    assert 5 == len(suite.findall("testcase"))
+
+
+def test_merge_cleanup(tmp_path):
+    parts = [str(tmp_path / "report_w{}_cleanup.json".format(worker)) for worker in range(3)]
+    for part, duration in zip(parts, (1.5, 0.5)):
+        with open(part, 'w') as json_file:
+            json.dump({'duration': duration, 'total': 1, 'undone': 1, 'failed': 0,
+                       'resources': [{'kind': 'issue', 'status': 'undone'}]}, json_file)
+
+    merge_cleanup(parts, str(tmp_path / "report_cleanup.json"))
+
+    with open(str(tmp_path / "report_cleanup.json")) as json_file:
+        report = json.load(json_file)
+    assert (1.5, 2, 2) == (report['duration'], report['total'], len(report['resources']))
+    assert ["report_cleanup.json"] == [path.name for path in tmp_path.iterdir()]
+
+
+@pytest.mark.parametrize("exit_codes, expected", [
+    ([0, 0], 0),
+    ([1, 5], 1),
+    ([5, 3, 1], 3),
+    ([0, 5], 0),
+    ([5, 5], 5),
+])
+def test_combine_exit_codes(exit_codes, expected):
+    assert expected == combine_exit_codes(exit_codes)
+
+
+def test_worker_test_data_is_merged(tmp_path, monkeypatch):
+    """Workers save created items to own files, so items of one worker are not overwritten by another"""
+    snapshot = str(tmp_path / "config.json")
+    parent_data = Properties()
+    parent_data.github_login = "stub-user"
+    monkeypatch.setattr(PropertyConfigurator, '_json_file', snapshot)
+    monkeypatch.setattr(PropertyConfigurator, '_save_file', snapshot)
+    monkeypatch.setattr(PropertyConfigurator, '_test_data', parent_data)
+    monkeypatch.setattr(PropertyConfigurator, '_validated', {'github_login'})
+    PropertyConfigurator._save()
+
+    for worker in (1, 2):
+        worker_data = Properties()
+        worker_data.deserialize(snapshot)
+        monkeypatch.setattr(PropertyConfigurator, '_save_file', PropertyConfigurator._worker_file(worker))
+        monkeypatch.setattr(PropertyConfigurator, '_test_data', worker_data)
+        PropertyConfigurator.get_or_create("unit_issue_w{}".format(worker), lambda: worker)
+
+    monkeypatch.setattr(PropertyConfigurator, '_save_file', snapshot)
+    monkeypatch.setattr(PropertyConfigurator, '_test_data', parent_data)
+    PropertyConfigurator.merge_workers(2)
+
+    with open(snapshot) as json_file:
+        assert {'github_login': "stub-user", 'unit_issue_w1': 1, 'unit_issue_w2': 2} == json.load(json_file)
+    assert ["config.json"] == [path.name for path in tmp_path.iterdir()]
+
+
+def _log_in_child():
+    logging.warning("Record of forked worker")
+    logger.shutdown()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork is not available")
+def test_forked_worker_doesnt_use_parent_log_queue(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    handlers, level = root.handlers, root.level
+    try:
+        logger.initialize("config_unit.ini", queue_mode="block")
+        child = multiprocessing.get_context("fork").Process(target=_log_in_child)
+        child.start()
+        child.join(10)
+        logger.shutdown()
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers, root.level = handlers, level
+
+    assert 0 == child.exitcode
+    assert "Record of forked worker" in (tmp_path / "info_unit.log").read_text()
+
+
+def _square(number: int) -> int:
+    return number * number
+
+
+def _fake_run_config(args) -> dict:
+    if args.config == "config_crash.ini":
+        os._exit(1)
+    # Tests of the config may start process pools, e.g. get_enterprise_details_many
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        squares = list(executor.map(_square, range(3)))
+    return {'config': args.config, 'exit_code': 0, 'squares': squares}
+
+
+@pytest.mark.skipif("fork" != multiprocessing.get_start_method(), reason="patched run_config is passed by fork")
+def test_matrix_configs_can_start_process_pools(monkeypatch):
+    monkeypatch.setattr(runner, 'run_config', _fake_run_config)
+    cells = [argparse.Namespace(config=config) for config in ("config_a.ini", "config_crash.ini", "config_b.ini")]
+
+    runs = runner._run_configs(cells, processes=2)
+
+    assert ["config_a.ini", "config_crash.ini", "config_b.ini"] == [run['config'] for run in runs]
+    assert [0, 3, 0] == [run['exit_code'] for run in runs]
+    assert [0, 1, 4] == runs[0]['squares']
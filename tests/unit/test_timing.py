@@ -0,0 +1,85 @@
+import http.server
+import logging
+import threading
+
+import pytest
+
+from github_sdk import TimingCollector
+from github_sdk.session import GithubSession
+
+
+class _RedirectHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(302)
+        self.send_header('Location', self.server.target)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def redirect_server(stub):
+    """
+    Server redirecting every GET to stub /user
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RedirectHandler)
+    server.target = stub.url + "/user"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def _session(timings: list) -> GithubSession:
+    session = GithubSession()
+    session.add_hook('after_response', lambda request, response, timing: timings.append(timing))
+    return session
+
+
+def test_dns_and_connect_are_measured_separately(stub):
+    timings = list()
+    session = _session(timings)
+    url = stub.url.replace("127.0.0.1", "localhost") + "/user"
+    session.get(url)
+    session.get(url)
+
+    first, reused = timings
+    assert 0 < first['dns']
+    assert 0 < first['connect']
+    assert first['total'] >= first['dns'] + first['connect']
+    assert (0, 0) == (reused['dns'], reused['connect'])
+
+
+def test_redirect_keeps_timings_of_outer_request(stub, redirect_server):
+    timings = list()
+    session = _session(timings)
+    # Connection to stub is kept alive, so redirected request doesn't connect again
+    session.get(stub.url + "/user")
+    timings.clear()
+
+    response = session.get(redirect_server + "/old")
+
+    assert 200 == response.status_code
+    redirected, outer = timings
+    assert "GET /user" == redirected['endpoint']
+    assert 0 == redirected['connect']
+    assert "GET /old" == outer['endpoint']
+    assert 0 < outer['connect']
+
+
+def test_failing_hook_is_logged(stub, caplog):
+    collector = TimingCollector()
+    session = GithubSession()
+    session.add_hook('after_response', lambda request, response, timing: 1 / 0)
+    session.add_hook('after_response', collector.record)
+
+    with caplog.at_level(logging.ERROR):
+        response = session.get(stub.url + "/user")
+
+    assert 200 == response.status_code
+    assert "ZeroDivisionError" in caplog.text or "division by zero" in caplog.text
+    assert 1 == collector.stats["GET /user"]['count']
+    assert "dns" in collector.format_table()
@@ -0,0 +1,90 @@
+import json
+from types import SimpleNamespace
+from typing import Callable
+
+import pytest
+
+from github_sdk import GITHUB, ResourceTracker
+
+
+@pytest.fixture()
+def rename(make_request, make_response) -> Callable[[ResourceTracker, str, str], None]:
+    """
+    Pass successful branch rename to tracker: rename(tracker, branch, new_name)
+    """
+    def record(tracker: ResourceTracker, branch: str, new_name: str):
+        request = make_request("http://stub/repos/owner/repo/branches/{}/rename".format(branch), "POST",
+                               json.dumps({'new_name': new_name}).encode())
+        tracker.record(request, make_response(201), {})
+    return record
+
+
+@pytest.fixture()
+def github_api(make_response) -> SimpleNamespace:
+    """
+    GITHUB stand-in remembering undo calls
+    """
+    calls = []
+    ok = make_response(200)
+    return SimpleNamespace(calls=calls,
+                           branch=SimpleNamespace(rename_branch=lambda *args: calls.append(('rename',) + args) or ok),
+                           issues=SimpleNamespace(close_issue=lambda *args: calls.append(('close',) + args) or ok))
+
+
+def test_renames_are_collapsed_to_original_name(github_api, rename):
+    tracker = ResourceTracker()
+    rename(tracker, "demo", "first")
+    rename(tracker, "first", "second")
+    assert 1 == tracker.pending
+
+    report = tracker.sweep(github_api)
+
+    assert [('rename', 'owner', 'repo', 'second', 'demo')] == github_api.calls
+    assert 1 == report['undone']
+
+
+def test_rename_back_leaves_nothing_to_undo(rename):
+    tracker = ResourceTracker()
+    rename(tracker, "demo", "demo_edit")
+    rename(tracker, "demo_edit", "demo")
+
+    assert 0 == tracker.pending
+
+
+def test_created_issues_are_closed(github_api, make_request, make_response, rename):
+    tracker = ResourceTracker()
+    tracker.record(make_request("http://stub/repos/owner/repo/issues", "POST", b'{}'),
+                   make_response(201, body=b'{"number": 7}'), {})
+    tracker.record(make_request("http://stub/repos/owner/repo/issues", "POST", b'{}'),
+                   make_response(422), {})
+
+    report = tracker.sweep(github_api)
+
+    assert [('close', 'owner', 'repo', 7)] == github_api.calls
+    assert {'total': 1, 'undone': 1, 'failed': 0} == {key: report[key] for key in ('total', 'undone', 'failed')}
+    # Requests of the sweep are not tracked again
+    rename(tracker, "demo", "demo_edit")
+    assert 0 == tracker.pending
+
+
+def test_sweep_over_stub_undoes_hooked_changes(stub, tmp_path):
+    tracker = ResourceTracker()
+    github_api = GITHUB(stub.url, "token", shared_pool=False)
+    github_api.add_hook("after_response", tracker.record)
+    for number in range(5):
+        github_api.issues.create_issues("owner", "repo", "Issue {}".format(number), "", "owner", "bug")
+    github_api.branch.rename_branch("owner", "repo", "demo", "demo_edit")
+    github_api.branch.rename_branch("owner", "repo", "main", "main_edit")
+    # Branch renamed again without tracking can't be renamed back, the failure is reported
+    tracker.recording = False
+    github_api.branch.rename_branch("owner", "repo", "main_edit", "other")
+    tracker.recording = True
+
+    report = tracker.sweep(github_api, concurrency=3)
+
+    assert (7, 6, 1) == (report['total'], report['undone'], report['failed'])
+    assert [] == github_api.issues.list_issues("owner", "repo").json
+    assert {"demo", "other"} == {branch['name'] for branch in github_api.branch.iter_branches("owner", "repo")}
+    report_file = ResourceTracker.write_report(report, str(tmp_path / "reports" / "report_cleanup.json"))
+    with open(report_file) as json_file:
+        assert report == json.load(json_file)
@@ -1 +1 @@
-from .property_manager import Properties, PropertyError, get_property, set_property
+from .property_manager import Properties, PropertyError, get_property, set_property, set_properties